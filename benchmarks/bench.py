@@ -0,0 +1,190 @@
+# Benchmarks the vendor and admin code paths against the in-memory sheet backend.
+#
+#   python -m benchmarks.bench                          # 1k, 10k, 100k and 500k rows
+#   python -m benchmarks.bench --sizes 1000 10000 --latency 0.05
+#
+# Every run is appended to benchmarks/results.jsonl, tagged with the current git
+# commit, and printed next to the most recent numbers from a different commit.
+import argparse
+import json
+import os
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import make_sheet, vendor_sizes
+from reporting import rollup
+from sheet_data import SNAPSHOT_COLUMNS, SnapshotCache, VendorRows, incomplete_positions, stream_frame
+from storage import LocalSheetBackend
+from submission_queue import SubmissionFlusher, SubmissionJournal
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 500_000]
+RESULTS_PATH = os.path.join(os.path.dirname(__file__), "results.jsonl")
+
+# Matches the default page size of the vendor table
+PAGE_ROWS = 25
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# --- Timing, API call and memory capture for one phase ---
+class PhaseRecorder:
+    def __init__(self, rows, backend, track_memory):
+        self.rows = rows
+        self.backend = backend
+        self.track_memory = track_memory
+        self.records = []
+
+    def measure(self, phase, fn):
+        calls_before = sum(self.backend.calls.values())
+        if self.track_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = fn()
+        wall = time.perf_counter() - started
+        peak = None
+        if self.track_memory:
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            tracemalloc.stop()
+
+        self.records.append({
+            "rows": self.rows,
+            "phase": phase,
+            "wall_s": round(wall, 4),
+            "api_calls": sum(self.backend.calls.values()) - calls_before,
+            "peak_mb": None if peak is None else round(peak, 2)
+        })
+        return result
+
+
+# --- Phases ---
+def render_prep(snapshot, vendor_rows):
+    # What one rerun of the vendor table does before creating widgets
+    skus, positions = vendor_rows.remaining(snapshot, set())
+    page = snapshot.df.iloc[positions[:PAGE_ROWS]]
+    image_urls = [str(url).strip() for url in page["ImageURL"] if str(url).strip()]
+    return skus, image_urls
+
+
+def submit_all(cache, snapshot, vendor_id, vendor_rows, journal_path):
+    # Submit All for every pending row of the vendor, then drain the journal
+    journal = SubmissionJournal(journal_path)
+    submissions = {
+        str(sku): {"CountryofOrigin": "US - United States", "HTSCode": "0601101500"}
+        for sku in vendor_rows.skus
+    }
+    journal.enqueue(vendor_id, submissions)
+    for sku, values in submissions.items():
+        cache.apply_write(sku, values)
+
+    flusher = SubmissionFlusher(journal, snapshot.write)
+    while flusher.flush():
+        pass
+    return journal.pending_count()
+
+
+def aggregate(snapshot):
+    # Everything the admin dashboard derives from the data
+    matrix = snapshot.progress.matrix()
+    by_vendor = rollup(matrix, "vendor")
+    by_owner = rollup(matrix, "owner")
+    per_owner = {owner: rollup(group, "vendor") for owner, group in matrix.groupby("owner", sort=False)}
+    return by_vendor, by_owner, per_owner
+
+
+def run_size(rows, latency, track_memory):
+    sheet = make_sheet(rows)
+    sizes = vendor_sizes(sheet)
+    sample_vendors = [sizes.index[0], sizes.index[len(sizes) // 2], sizes.index[-1]]
+    backend = LocalSheetBackend.from_frame(sheet, latency=latency)
+    del sheet
+
+    recorder = PhaseRecorder(rows, backend, track_memory)
+    cache = SnapshotCache()
+
+    def loader():
+        chunks, headers, change_token = backend.load(SNAPSHOT_COLUMNS)
+        df, streamed = stream_frame(chunks)
+        return df, headers, backend, change_token, streamed
+
+    snapshot = recorder.measure("load", lambda: cache.get(loader))
+    df = snapshot.df
+
+    pending = recorder.measure("filter", lambda: [
+        VendorRows(snapshot, incomplete_positions(df, snapshot.index.vendor_positions(vendor_id)))
+        for vendor_id in sample_vendors
+    ])
+    largest_vendor, largest_pending = sample_vendors[0], pending[0]
+
+    recorder.measure("render_prep", lambda: render_prep(snapshot, largest_pending))
+    recorder.measure("aggregate", lambda: aggregate(snapshot))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        recorder.measure("submit_all", lambda: submit_all(
+            cache, snapshot, largest_vendor, largest_pending, os.path.join(tmp, "journal.db")
+        ))
+
+    for record in recorder.records:
+        record["vendor_rows"] = int(sizes.iloc[0])
+    return recorder.records
+
+
+# --- Results file ---
+def load_previous(path, commit):
+    # Latest record per (rows, phase) from any other commit
+    previous = {}
+    if not os.path.exists(path):
+        return previous
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("commit") != commit:
+                previous[(record["rows"], record["phase"])] = record
+    return previous
+
+
+def format_change(current, before):
+    if before in (None, 0) or current is None:
+        return ""
+    return f"{(current - before) / before:+.0%}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vendor and admin code paths on synthetic data")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per Sheets API call")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc for cleaner wall times")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = load_previous(args.output, commit)
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    print(f"{'rows':>8} {'phase':<12} {'wall s':>9} {'change':>7} {'api':>5} {'peak MB':>9} {'change':>7}")
+    with open(args.output, "a") as out:
+        for rows in args.sizes:
+            for record in run_size(rows, args.latency, not args.no_memory):
+                record.update({"commit": commit, "run_at": run_at, "latency": args.latency})
+                out.write(json.dumps(record) + "\n")
+
+                before = previous.get((rows, record["phase"]), {})
+                peak = "-" if record["peak_mb"] is None else f"{record['peak_mb']:.1f}"
+                print(
+                    f"{rows:>8} {record['phase']:<12} {record['wall_s']:>9.3f} "
+                    f"{format_change(record['wall_s'], before.get('wall_s')):>7} {record['api_calls']:>5} "
+                    f"{peak:>9} {format_change(record['peak_mb'], before.get('peak_mb')):>7}"
+                )
+
+
+if __name__ == "__main__":
+    main()
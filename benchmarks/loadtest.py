@@ -0,0 +1,311 @@
+# Drives simulated vendor sessions through the app against the in-memory sheet
+# backend, the way a campaign email brings hundreds of vendors in at once.
+#
+#   python -m benchmarks.loadtest --sessions 50 --concurrency 10
+#   python -m benchmarks.loadtest --scenario app --rows 100000 --sessions 200 --concurrency 25 --latency 0.2
+#
+# Two scenarios:
+#
+#   services (default)  Sessions run truly in parallel, one thread each, making
+#                       the calls the vendor page makes straight against one
+#                       shared snapshot cache, journal, flusher and Sheets
+#                       client, so their locks, the quota buckets and the
+#                       circuit breaker are contended the way they are on one
+#                       server. No widgets are rendered.
+#   app                 Every session is an AppTest of the real page in this
+#                       process. AppTest resets process-wide Streamlit state
+#                       after each run, so script runs are SEQUENTIAL: sessions
+#                       interleave, but only one script runs at a time. Latency
+#                       is the time a user waits, queueing for the runner
+#                       included, and "run" is the script time alone.
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synthetic import COUNTRIES, make_sheet, vendor_sizes
+from sheet_data import SNAPSHOT_COLUMNS, SnapshotCache, VendorRows, canonical_sku, incomplete_positions, stream_frame
+from sheets_client import READS_PER_MINUTE, WRITES_PER_MINUTE, SheetsClient
+from storage import LocalSheetBackend
+from submission_queue import (
+    SubmissionFlusher, SubmissionJournal, apply_pending_submissions, flush_to_sheet, queue_submissions
+)
+from summary import SummaryStore, SummaryWriter
+from validation import validate_edits
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Order interactions are reported in
+INTERACTIONS = ["login", "reload", "edit_country", "edit_hts", "submit_row", "submit_all"]
+
+# Rows on one page of the vendor table
+PAGE_ROWS = 25
+
+
+class LoadTest:
+    # Timings and errors shared by both scenarios
+    description = ""
+
+    def __init__(self, options, journal_path):
+        self.options = options
+        self.journal_path = journal_path
+        self.latencies = defaultdict(list)
+        self.run_times = defaultdict(list)
+        self.errors = []
+        self._lock = threading.Lock()
+
+    def record(self, vendor_id, interaction, latency, run_time, errors=()):
+        with self._lock:
+            self.latencies[interaction].append(latency)
+            self.run_times[interaction].append(run_time)
+            self.errors.extend(f"{vendor_id} {interaction}: {error}" for error in errors)
+
+    def think(self):
+        if self.options.think:
+            time.sleep(random.uniform(0.5, 1.5) * self.options.think)
+
+    def run_session_safely(self, vendor_id):
+        try:
+            self.run_session(vendor_id)
+        except Exception as e:
+            with self._lock:
+                self.errors.append(f"{vendor_id}: {type(e).__name__}: {e}")
+
+    def wait_for_flush(self):
+        # The sheet writes happen on the flusher thread after the sessions end
+        journal = SubmissionJournal(self.journal_path)
+        started = time.perf_counter()
+        while journal.pending_count() and time.perf_counter() - started < self.options.flush_timeout:
+            time.sleep(0.25)
+        return journal.pending_count(), time.perf_counter() - started
+
+
+# --- Concurrent sessions against the shared services ---
+class ServiceLoadTest(LoadTest):
+    description = "in parallel against the shared services"
+
+    def __init__(self, options, journal_path, summary_path, df):
+        super().__init__(options, journal_path)
+        # One of each shared object, as the app's st.cache_resource makes them
+        self.client = SheetsClient(
+            read_per_minute=options.read_quota or READS_PER_MINUTE,
+            write_per_minute=options.write_quota or WRITES_PER_MINUTE
+        )
+        self.backend = LocalSheetBackend.from_frame(
+            df, latency=options.latency, read_quota=options.read_quota,
+            write_quota=options.write_quota, client=self.client
+        )
+        self.journal = SubmissionJournal(journal_path)
+        self.cache = SnapshotCache(on_load=lambda snapshot: apply_pending_submissions(self.journal, snapshot))
+        self.flusher = SubmissionFlusher(self.journal, lambda updates: flush_to_sheet(self.cache, self.fetch, updates)).start()
+        self.summary_writer = SummaryWriter(
+            SummaryStore(summary_path), lambda: self.cache.get(self.fetch), self.cache.current
+        ).start()
+
+    def fetch(self):
+        chunks, headers, change_token = self.backend.load(SNAPSHOT_COLUMNS)
+        df, streamed = stream_frame(chunks)
+        return df, headers, self.backend, change_token, streamed
+
+    def step(self, vendor_id, interaction, action):
+        started = time.perf_counter()
+        errors = []
+        try:
+            result = action()
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            result = None
+        elapsed = time.perf_counter() - started
+        self.record(vendor_id, interaction, elapsed, elapsed, errors)
+        self.think()
+        return result
+
+    def submit(self, vendor_id, edits):
+        # save_submissions without the session state: the app's own queueing
+        submissions, _ = validate_edits(edits)
+        snapshot = self.cache.current() or self.cache.get(self.fetch)
+        results = queue_submissions(
+            self.journal, self.cache, snapshot, vendor_id, submissions, [self.flusher, self.summary_writer]
+        )
+        return {canonical_sku(sku) for sku, error in results.items() if error is None}
+
+    def run_session(self, vendor_id):
+        def login():
+            snapshot = self.cache.get_vendor(vendor_id, self.fetch)
+            return VendorRows(snapshot, incomplete_positions(snapshot.df, snapshot.index.vendor_positions(vendor_id)))
+
+        rows = self.step(vendor_id, "login", login)
+        if rows is None:
+            return
+        submitted = set()
+
+        def remaining():
+            return rows.remaining(self.cache.get_vendor(vendor_id, self.fetch), submitted)[0][:PAGE_ROWS]
+
+        skus = self.step(vendor_id, "reload", remaining) or []
+        for sku in skus[:self.options.row_submits]:
+            edit = (random.choice(COUNTRIES), f"{random.randint(0, 9999999999):010d}")
+            submitted |= self.step(vendor_id, "submit_row", lambda: self.submit(vendor_id, {sku: edit})) or set()
+
+        skus = self.step(vendor_id, "reload", remaining) or []
+        if skus:
+            edits = {sku: (random.choice(COUNTRIES), f"{random.randint(0, 9999999999):010d}") for sku in skus}
+            self.step(vendor_id, "submit_all", lambda: self.submit(vendor_id, edits))
+
+
+# --- Sessions through the real page, one script run at a time ---
+class AppLoadTest(LoadTest):
+    description = "through AppTest, script runs sequential"
+
+    def __init__(self, options, journal_path, secrets):
+        super().__init__(options, journal_path)
+        self.secrets = secrets
+        self._run_lock = threading.Lock()
+
+    def step(self, vendor_id, interaction, at, action=None):
+        # action sets widget values or clicks before the rerun that is timed
+        if action is not None:
+            action()
+        queued = time.perf_counter()
+        with self._run_lock:
+            started = time.perf_counter()
+            at.run()
+            finished = time.perf_counter()
+        self.record(vendor_id, interaction, finished - queued, finished - started, [e.value for e in at.exception])
+        self.think()
+
+    def row_skus(self, at):
+        return [b.key.split("_", 1)[1] for b in at.button if b.key and b.key.startswith("submit_")]
+
+    def run_session(self, vendor_id):
+        at = AppTest.from_file(APP_PATH, default_timeout=self.options.timeout)
+        at.query_params["vendor"] = vendor_id
+        # Only script runs read secrets; the app resolves what its background
+        # threads need before handing it to them
+        at.secrets.update(self.secrets)
+
+        # Opening the ?vendor= link logs in and renders the first page
+        self.step(vendor_id, "login", at)
+        self.step(vendor_id, "reload", at)
+
+        # Fill in and submit a few rows one at a time
+        for sku in self.row_skus(at)[:self.options.row_submits]:
+            country = at.text_input(key=f"country_{sku}")
+            self.step(vendor_id, "edit_country", at, lambda: country.input(random.choice(COUNTRIES)))
+            hts = at.text_input(key=f"hts_{sku}")
+            self.step(vendor_id, "edit_hts", at, lambda: hts.input(f"{random.randint(0, 9999999999):010d}"))
+            self.step(vendor_id, "submit_row", at, lambda: at.button(key=f"submit_{sku}").click())
+
+        # Fill in the rest of the page and send it with Submit All
+        skus = self.row_skus(at)
+        if not skus:
+            return
+
+        def fill_page():
+            for sku in skus:
+                at.text_input(key=f"country_{sku}").input(random.choice(COUNTRIES))
+                at.text_input(key=f"hts_{sku}").input(f"{random.randint(0, 9999999999):010d}")
+            next(b for b in at.button if b.label == "Submit All Remaining Items").click()
+
+        self.step(vendor_id, "submit_all", at, fill_page)
+
+
+def pick_vendors(df, count, seed):
+    # Vendors that still have work to do, each once before any repeats
+    incomplete = df[(df["CountryofOrigin"] == "") | (df["HTSCode"] == "")]
+    vendors = list(vendor_sizes(incomplete).index)
+    random.Random(seed).shuffle(vendors)
+    return [vendors[i % len(vendors)] for i in range(count)]
+
+
+def report(load_test, wall, api_calls, unflushed, flush_wait):
+    print(f"{'interaction':<14} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'run p50':>9} {'run p95':>9}")
+    for interaction in INTERACTIONS:
+        latencies = load_test.latencies.get(interaction)
+        if not latencies:
+            continue
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        run_p50, run_p95 = np.percentile(load_test.run_times[interaction], [50, 95]) * 1000
+        print(f"{interaction:<14} {len(latencies):>6} {p50:>9.0f} {p95:>9.0f} {p99:>9.0f} {run_p50:>9.0f} {run_p95:>9.0f}")
+
+    print(f"\nSessions finished in {wall:.1f}s; queued writes drained {flush_wait:.1f}s later"
+          + (f" with {unflushed} still pending" if unflushed else ""))
+    print(f"Sheets API calls: {sum(api_calls.values())} "
+          f"({', '.join(f'{name} {count}' for name, count in sorted(api_calls.items()))})")
+    if load_test.errors:
+        print(f"\n{len(load_test.errors)} errors, first few:")
+        for error in load_test.errors[:10]:
+            print(f"  {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the vendor dashboard with simulated sessions")
+    parser.add_argument("--scenario", choices=["services", "app"], default="services",
+                        help="services: parallel sessions against the shared objects; app: AppTest sessions, run sequentially")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="sessions in flight at once")
+    parser.add_argument("--row-submits", type=int, default=2, help="rows each session submits one at a time")
+    parser.add_argument("--think", type=float, default=0.0, help="average pause between interactions, seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per Sheets API call")
+    parser.add_argument("--read-quota", type=int, help="Sheets read requests allowed per minute")
+    parser.add_argument("--write-quota", type=int, help="Sheets write requests allowed per minute")
+    parser.add_argument("--with-images", action="store_true", help="keep image URLs, so thumbnails are fetched")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per interaction")
+    parser.add_argument("--flush-timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        df = make_sheet(args.rows, seed=args.seed)
+        if not args.with_images:
+            df["ImageURL"] = ""
+        sheet_path = os.path.join(tmp, "sheet.csv")
+        df.to_csv(sheet_path, index=False)
+
+        journal_path = os.path.join(tmp, "submissions.db")
+        summary_path = os.path.join(tmp, "summary.db")
+        secrets = {
+            "sheet_backend": "local",
+            "local_sheet_csv": sheet_path,
+            "local_sheet_latency": args.latency,
+            "local_sheet_read_quota": args.read_quota,
+            "local_sheet_write_quota": args.write_quota,
+            "submission_journal_path": journal_path,
+            "summary_path": summary_path,
+            "thumbnail_cache_dir": os.path.join(tmp, "thumbnails"),
+            "admin_password": ""
+        }
+        # The app's request budget follows the simulated quota when one is given
+        if args.read_quota:
+            secrets["sheets_read_quota"] = args.read_quota
+        if args.write_quota:
+            secrets["sheets_write_quota"] = args.write_quota
+        if args.scenario == "app":
+            load_test = AppLoadTest(args, journal_path, secrets)
+        else:
+            load_test = ServiceLoadTest(args, journal_path, summary_path, df)
+
+        vendors = pick_vendors(df, args.sessions, args.seed)
+        print(f"{args.sessions} sessions over {len(set(vendors))} vendors, {args.concurrency} at a time "
+              f"{load_test.description}, {args.rows} rows, {args.latency * 1000:.0f} ms per API call\n")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(load_test.run_session_safely, vendors))
+        wall = time.perf_counter() - started
+
+        unflushed, flush_wait = load_test.wait_for_flush()
+        report(load_test, wall, LocalSheetBackend.total_calls, unflushed, flush_wait)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Measures the login page's time to first paint in a fresh Python process,
+# the cost every cold server start and every new worker pays.
+#
+#   python -m benchmarks.startup
+#   python -m benchmarks.startup --samples 10
+#
+# Each sample starts a new interpreter that imports Streamlit's test runner
+# and renders the login page once. "script" is the app's own run, imports
+# included; "process" adds interpreter and Streamlit start-up. Results are
+# appended to benchmarks/results.jsonl next to the bench.py phases.
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+
+from benchmarks.bench import RESULTS_PATH, format_change, git_commit, load_previous
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Modules the login page should not need
+HEAVY_MODULES = ["plotly", "gspread", "google.auth", "PIL", "requests", "pycountry", "pandas"]
+
+SAMPLE_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded_before = set(sys.modules)
+imported = time.perf_counter()
+at = AppTest.from_file({app_path!r}, default_timeout=120)
+at.secrets["admin_password"] = ""
+at.run()
+finished = time.perf_counter()
+print(json.dumps({{
+    "process_s": finished - started,
+    "script_s": finished - imported,
+    "imported_by_app": sorted(m for m in {heavy!r} if m in sys.modules and m not in loaded_before),
+    "errors": [str(e.value) for e in at.exception]
+}}))
+"""
+
+
+def sample(python):
+    script = SAMPLE_SCRIPT.format(app_path=APP_PATH, heavy=HEAVY_MODULES)
+    output = subprocess.run([python, "-c", script], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the login page's first paint in a fresh process")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--output", default=RESULTS_PATH)
+    args = parser.parse_args()
+
+    samples = [sample(args.python) for _ in range(args.samples)]
+    errors = sorted({error for s in samples for error in s["errors"]})
+    imported = sorted({module for s in samples for module in s["imported_by_app"]})
+
+    commit = git_commit()
+    previous = load_previous(args.output, commit)
+    run_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    print(f"{'phase':<22} {'p50 s':>9} {'change':>7} {'min s':>9}")
+    with open(args.output, "a") as out:
+        for phase, key in [("login_first_paint", "script_s"), ("login_cold_process", "process_s")]:
+            times = [s[key] for s in samples]
+            record = {
+                "rows": None,
+                "phase": phase,
+                "wall_s": round(float(np.median(times)), 4),
+                "min_s": round(min(times), 4),
+                "samples": len(times),
+                "commit": commit,
+                "run_at": run_at
+            }
+            out.write(json.dumps(record) + "\n")
+            before = previous.get((None, phase), {})
+            print(f"{phase:<22} {record['wall_s']:>9.3f} {format_change(record['wall_s'], before.get('wall_s')):>7} {record['min_s']:>9.3f}")
+
+    print(f"\nHeavy modules imported by the login page: {', '.join(imported) or 'none'}")
+    if errors:
+        print(f"Script errors: {'; '.join(errors)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ["US - United States", "CN - China", "MX - Mexico", "CA - Canada", "IT - Italy", "DE - Germany"]
+
+
+def make_sheet(rows, seed=0, extra_columns=10, completed_share=0.35):
+    # A Sheet1 lookalike: a few vendors own most SKUs (Zipf-skewed), items are
+    # spread over many TaxPathOwners, and the real sheet's unused columns are
+    # padded in so column projection has something to skip
+    rng = np.random.default_rng(seed)
+
+    vendor_count = max(5, rows // 250)
+    weights = 1.0 / np.arange(1, vendor_count + 1) ** 1.1
+    vendors = rng.choice(vendor_count, size=rows, p=weights / weights.sum())
+
+    owner_count = 40
+    owners = (vendors * 7 + rng.integers(0, 3, size=rows)) % owner_count
+    owner_names = np.array([f"Owner {i:02d}" for i in range(owner_count)] + [""], dtype=object)
+    owners[rng.random(rows) < 0.05] = owner_count
+
+    skus = rng.permutation(rows) + 100000
+    completed = rng.random(rows) < completed_share
+    countries = np.array(COUNTRIES, dtype=object)[rng.integers(0, len(COUNTRIES), size=rows)]
+    hts = np.char.zfill(rng.integers(101000000, 9999999999, size=rows).astype(str), 10).astype(object)
+
+    taxonomy = np.array(
+        [f"Category {i // 10} > Subcategory {i % 10}" for i in range(200)], dtype=object
+    )[rng.integers(0, 200, size=rows)]
+
+    df = pd.DataFrame({
+        "SKUID": skus.astype(str),
+        "SiteOneItemNumber": rng.integers(100000, 999999, size=rows).astype(str),
+        "ProductName": [f"Product {sku}" for sku in skus],
+        "Taxonomy": taxonomy,
+        "PrimaryVendorNumber": [f"V{v:05d}" for v in vendors],
+        "PrimaryVendorName": [f"Vendor {v:05d}" for v in vendors],
+        "TaxPathOwner": owner_names[owners],
+        "ImageURL": np.where(rng.random(rows) < 0.8, [f"https://images.example.com/{sku}.jpg" for sku in skus], ""),
+        "CountryofOrigin": np.where(completed, countries, ""),
+        "HTSCode": np.where(completed, hts, ""),
+    })
+    for i in range(extra_columns):
+        df[f"Attribute{i + 1}"] = rng.integers(0, 1000, size=rows).astype(str)
+    return df
+
+
+def vendor_sizes(df):
+    return df["PrimaryVendorNumber"].value_counts()
@@ -0,0 +1,97 @@
+import zipfile
+
+import pandas as pd
+
+from sheet_data import canonical_sku
+from validation import EMPTY_ROW, validate_pending
+
+# Rows of an uploaded CSV parsed and validated at a time
+UPLOAD_CHUNK_ROWS = 5000
+
+# Columns of the downloadable template; vendors fill in the last two
+TEMPLATE_COLUMNS = ["SKUID", "SiteOneItemNumber", "ProductName", "Taxonomy", "CountryofOrigin", "HTSCode"]
+REQUIRED_COLUMNS = ["SKUID", "CountryofOrigin", "HTSCode"]
+REPORT_COLUMNS = ["Row", "SKU", "Error"]
+
+# Row 1 of the file is the header
+FIRST_FILE_ROW = 2
+
+
+class UploadError(ValueError):
+    pass
+
+
+# --- Template of a vendor's remaining items ---
+def template_frame(df, positions):
+    template = df.iloc[positions][TEMPLATE_COLUMNS[:4]].astype(str)
+    template["CountryofOrigin"] = ""
+    template["HTSCode"] = ""
+    return template
+
+
+def template_csv(df, positions):
+    return template_frame(df, positions).to_csv(index=False).encode("utf-8")
+
+
+# --- Reading and validating an upload ---
+def read_upload(name, data):
+    # Yields chunks of text cells, indexed by position in the file. CSVs are
+    # parsed a chunk at a time; Excel files can only be read whole and are
+    # then validated in the same chunks.
+    if name.lower().endswith(".xlsx"):
+        try:
+            frame = pd.read_excel(data, dtype=str, keep_default_na=False)
+        except Exception as e:
+            # A corrupt or renamed file fails in zipfile or openpyxl with
+            # errors of their own, not only ValueError
+            raise UploadError(f"Could not read {name} as an Excel workbook: {e}") from e
+        for start in range(0, len(frame), UPLOAD_CHUNK_ROWS):
+            yield frame.iloc[start:start + UPLOAD_CHUNK_ROWS]
+        return
+
+    try:
+        yield from pd.read_csv(data, dtype=str, keep_default_na=False, chunksize=UPLOAD_CHUNK_ROWS)
+    except (ValueError, zipfile.BadZipFile, KeyError, OSError) as e:
+        # Parser and decoding errors are ValueErrors; compressed or unreadable
+        # files raise the others
+        raise UploadError(f"Could not read {name}: {e}") from e
+
+
+def validate_chunk(chunk, vendor_skus, hts_index=None):
+    # One vectorized pass; returns (submissions, error rows, blank row count)
+    skus = chunk["SKUID"].map(canonical_sku)
+    values, _, reasons = validate_pending(chunk, hts_index)
+
+    # The template lists every remaining item; rows left empty are not errors
+    blank = reasons == EMPTY_ROW
+    reasons = reasons.mask(~blank & ~skus.isin(vendor_skus), "SKU is not one of this vendor's remaining items")[~blank]
+
+    valid = reasons.index[reasons == ""]
+    invalid = reasons.index[reasons != ""]
+    submissions = dict(zip(skus[valid], zip(values.loc[valid, "CountryofOrigin"], values.loc[valid, "HTSCode"])))
+    errors = pd.DataFrame({
+        "Row": invalid + FIRST_FILE_ROW,
+        "SKU": chunk.loc[invalid, "SKUID"],
+        "Error": reasons[invalid]
+    })
+    return submissions, errors, int(blank.sum())
+
+
+def process_upload(name, data, vendor_skus, hts_index=None):
+    # Returns SKU -> (country label, HTS code) for the valid rows, an error
+    # report for the rest, and the number of blank rows skipped. A SKU listed
+    # twice keeps its last row, as a resubmission does.
+    vendor_skus = {canonical_sku(sku) for sku in vendor_skus}
+    submissions = {}
+    errors = []
+    skipped = 0
+    for chunk in read_upload(name, data):
+        missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+        if missing:
+            raise UploadError(f"Missing column(s): {', '.join(missing)}. Please use the downloaded template.")
+        chunk_submissions, chunk_errors, chunk_skipped = validate_chunk(chunk, vendor_skus, hts_index)
+        submissions.update(chunk_submissions)
+        errors.append(chunk_errors)
+        skipped += chunk_skipped
+    report = pd.concat(errors, ignore_index=True) if errors else pd.DataFrame(columns=REPORT_COLUMNS)
+    return submissions, report, skipped
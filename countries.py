@@ -0,0 +1,90 @@
+import bisect
+import re
+
+import pycountry
+
+# Names vendors commonly type that pycountry does not list, mapped to ISO alpha-2
+COUNTRY_ALIASES = {
+    "USA": "US",
+    "U.S.": "US",
+    "U.S.A.": "US",
+    "AMERICA": "US",
+    "UNITED STATES OF AMERICA": "US",
+    "UK": "GB",
+    "U.K.": "GB",
+    "BRITAIN": "GB",
+    "GREAT BRITAIN": "GB",
+    "ENGLAND": "GB",
+    "SOUTH KOREA": "KR",
+    "KOREA": "KR",
+    "NORTH KOREA": "KP",
+    "TAIWAN": "TW",
+    "VIETNAM": "VN",
+    "RUSSIA": "RU",
+    "HOLLAND": "NL",
+    "CZECH REPUBLIC": "CZ",
+    "TURKEY": "TR",
+    "IRAN": "IR",
+    "PRC": "CN",
+    "MAINLAND CHINA": "CN",
+    "HONG KONG": "HK",
+    "UAE": "AE",
+}
+
+# Suggestions offered for text that does not resolve to a country
+SEARCH_LIMIT = 5
+
+
+def search_key(text):
+    return re.sub(r"\s+", " ", str(text)).strip().upper()
+
+
+# --- Option list and search index, built once per process ---
+class CountryIndex:
+    def __init__(self, countries, aliases):
+        # ISO alpha-2 -> the "US - United States" label written to the sheet
+        self.labels = {c.alpha_2: f"{c.alpha_2} - {c.name}" for c in countries}
+        self.options = sorted(self.labels.values())
+
+        # Every spelling that resolves to a country: both ISO codes, the
+        # official and common names, the picker label and the aliases above
+        self._keys = {}
+        for c in countries:
+            for name in (c.alpha_2, c.alpha_3, c.name, getattr(c, "official_name", None),
+                         getattr(c, "common_name", None), self.labels[c.alpha_2]):
+                if name:
+                    self._keys.setdefault(search_key(name), c.alpha_2)
+        for alias, code in aliases.items():
+            self._keys.setdefault(search_key(alias), code)
+
+        # Sorted (key, label) pairs for prefix search by bisection
+        self._sorted = sorted((key, self.labels[code]) for key, code in self._keys.items())
+
+    def resolve(self, text):
+        # Label for an exact code, name or alias; None if there is no exact match
+        code = self._keys.get(search_key(text))
+        return None if code is None else self.labels[code]
+
+    def resolve_many(self, values):
+        # Vectorized resolve over a Series of text; NaN where nothing matches
+        keys = values.fillna("").astype(str).str.replace(r"\s+", " ", regex=True).str.strip().str.upper()
+        return keys.map(self._keys).map(self.labels)
+
+    def search(self, prefix, limit=SEARCH_LIMIT):
+        # Distinct labels whose code, name or alias starts with prefix
+        key = search_key(prefix)
+        if not key:
+            return []
+        matches = []
+        start = bisect.bisect_left(self._sorted, (key,))
+        for candidate, label in self._sorted[start:]:
+            if not candidate.startswith(key):
+                break
+            if label not in matches:
+                matches.append(label)
+                if len(matches) == limit:
+                    break
+        return matches
+
+
+COUNTRIES = CountryIndex(list(pycountry.countries), COUNTRY_ALIASES)
@@ -0,0 +1,78 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Keep-alive connections to Google shared by every script thread and the flusher
+POOL_CONNECTIONS = 16
+
+# Tokens are renewed this long before they expire, so no request waits on a refresh
+REFRESH_MARGIN_SECONDS = 300
+REFRESH_RETRY_SECONDS = 30
+
+
+# --- One authorized gspread client per server ---
+# Authorizing mints a token and opens a new HTTPS connection, and opening the
+# spreadsheet costs two metadata requests. All of that now happens once per
+# process instead of on every load.
+class GspreadConnection:
+    def __init__(self, service_account_info, scopes, sheets_client=None, pool_size=POOL_CONNECTIONS):
+        self.credentials = Credentials.from_service_account_info(service_account_info, scopes=scopes)
+        self.sheets_client = sheets_client
+        self._refresh_lock = threading.Lock()
+        self._worksheet_lock = threading.Lock()
+        self._worksheets = {}
+        self.refresh()
+
+        # urllib3's pool is thread-safe, so one session serves concurrent requests
+        session = AuthorizedSession(self.credentials)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        self.client = gspread.Client(self.credentials, session=session)
+
+        self._thread = threading.Thread(target=self._run, name="gspread-token-refresh", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def refresh(self):
+        with self._refresh_lock, metrics.timed("sheets.token_refresh"):
+            self.credentials.refresh(Request())
+
+    def seconds_until_refresh(self):
+        # google-auth keeps expiry as naive UTC
+        if self.credentials.expiry is None:
+            return 0
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return max(0, (self.credentials.expiry - now).total_seconds() - REFRESH_MARGIN_SECONDS)
+
+    def _run(self):
+        while True:
+            time.sleep(self.seconds_until_refresh())
+            try:
+                self.refresh()
+            except Exception:
+                # Requests still refresh inline if the token does lapse; try again soon
+                time.sleep(REFRESH_RETRY_SECONDS)
+
+    def _call(self, fn, *args):
+        if self.sheets_client is None:
+            return fn(*args)
+        return self.sheets_client.call("read", fn, *args)
+
+    def worksheet(self, spreadsheet_key, title):
+        with self._worksheet_lock:
+            worksheet = self._worksheets.get((spreadsheet_key, title))
+            if worksheet is None:
+                with metrics.timed("sheets.open"):
+                    spreadsheet = self._call(self.client.open_by_key, spreadsheet_key)
+                    worksheet = self._call(spreadsheet.worksheet, title)
+                self._worksheets[(spreadsheet_key, title)] = worksheet
+            return worksheet
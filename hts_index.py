@@ -0,0 +1,157 @@
+import argparse
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# USITC's "HTS Number, Indent, Description, ..." CSV export of the schedule,
+# kept beside this module so it is found from any working directory
+HTS_SCHEDULE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hts_schedule.csv")
+
+# Where fetch_schedule downloads that export from: every chapter, no styling
+HTS_EXPORT_URL = "https://hts.usitc.gov/reststop/exportList?from=0100&to=9999&format=CSV&styles=false"
+
+# Digit lengths of headings, subheadings, tariff lines and statistical lines
+HTS_LEVELS = [4, 6, 8, 10]
+
+# Completions offered for a partly typed code
+COMPLETION_LIMIT = 8
+
+# Characters people type between the digits of a code ("0601.10 15"); the
+# hint and the submit-time validation both strip exactly these
+HTS_SEPARATORS = r"[.\s]"
+
+
+def hts_digits(code):
+    return re.sub(HTS_SEPARATORS, "", str(code))
+
+
+def format_hts(digits):
+    # "0601101500" -> "0601.10.15.00"
+    parts = [digits[:4], digits[4:6], digits[6:8], digits[8:10]]
+    return ".".join(part for part in parts if part)
+
+
+# --- Sorted-array index of the tariff schedule ---
+# Codes are kept as one sorted fixed-width string array, so a lookup or a
+# prefix range is a pair of binary searches with no per-code Python objects.
+class HTSIndex:
+    def __init__(self, codes, descriptions):
+        codes = np.asarray(codes, dtype="U10")
+        order = np.argsort(codes, kind="stable")
+        self.codes = codes[order]
+        self.descriptions = np.asarray(descriptions, dtype=object)[order]
+
+        # A 10-digit code is valid if it is a statistical line, or is an
+        # 8-digit tariff line with no statistical breakdown plus "00"
+        lengths = np.char.str_len(self.codes)
+        statistical = self.codes[lengths == 10]
+        broken_down = np.unique(statistical.astype("U8"))
+        tariff_lines = self.codes[lengths == 8]
+        leaves = tariff_lines[~np.isin(tariff_lines, broken_down)]
+        self._valid = np.unique(np.concatenate([statistical, np.char.add(leaves, "00")]))
+
+    @classmethod
+    def from_csv(cls, path):
+        schedule = pd.read_csv(path, dtype=str, keep_default_na=False, usecols=["HTS Number", "Indent", "Description"])
+        codes = []
+        descriptions = []
+        parents = []
+        for number, indent, description in schedule.itertuples(index=False):
+            # Unnumbered rows are text headings; they only label the rows beneath them
+            depth = int(indent) if indent.strip().isdigit() else 0
+            parents = parents[:depth] + [description.strip()]
+            digits = hts_digits(number)
+            if not digits.isdigit() or len(digits) not in HTS_LEVELS:
+                continue
+            # "Other" means little on its own, so name the parent too
+            if description.strip().lower().startswith("other") and len(parents) > 1:
+                description = f"{parents[-2]}: {description.strip()}"
+            codes.append(digits)
+            descriptions.append(description.strip())
+        return cls(codes, descriptions)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def _range(self, prefix):
+        # Slice of codes starting with prefix; "A" sorts after every digit
+        return np.searchsorted(self.codes, prefix, "left"), np.searchsorted(self.codes, prefix + "A", "left")
+
+    def is_valid(self, code):
+        digits = hts_digits(code)
+        position = np.searchsorted(self._valid, digits)
+        return position < len(self._valid) and self._valid[position] == digits
+
+    def valid_many(self, codes):
+        # Vectorized is_valid over a Series of normalized 10-digit codes
+        values = codes.fillna("").astype(str).to_numpy()
+        return np.isin(values, self._valid)
+
+    def describe(self, code):
+        # Description of a valid code: its own line, or for a tariff line with
+        # no statistical breakdown, the 8-digit line it pads with "00"
+        digits = hts_digits(code)
+        if not self.is_valid(digits):
+            return None
+        for candidate in (digits, digits[:8]):
+            position = np.searchsorted(self.codes, candidate)
+            if position < len(self.codes) and self.codes[position] == candidate:
+                return self.descriptions[position]
+        return None
+
+    def complete(self, prefix, limit=COMPLETION_LIMIT):
+        # (formatted code, description) for codes one level below prefix: 6 -> 8 -> 10 digits
+        digits = hts_digits(prefix)
+        if not digits.isdigit():
+            return []
+        deeper = [level for level in HTS_LEVELS if level > len(digits)]
+        if not deeper:
+            return []
+        start, end = self._range(digits)
+        candidates = self.codes[start:end]
+        matches = np.flatnonzero(np.char.str_len(candidates) == deeper[0])[:limit] + start
+        return [(format_hts(self.codes[i]), self.descriptions[i]) for i in matches]
+
+
+def load_schedule(path=HTS_SCHEDULE_PATH):
+    # None when no schedule is deployed; callers then only check the digit count
+    if not path or not os.path.exists(path):
+        return None
+    return HTSIndex.from_csv(path)
+
+
+def fetch_schedule(url=HTS_EXPORT_URL, path=HTS_SCHEDULE_PATH):
+    # Downloads the schedule, and only replaces the current file once the
+    # download parses, so a failed fetch leaves the old schedule in place
+    import requests
+    response = requests.get(url, timeout=300)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    partial = f"{path}.part"
+    with open(partial, "wb") as f:
+        f.write(response.content)
+    try:
+        index = HTSIndex.from_csv(partial)
+        if not len(index):
+            raise ValueError(f"No HTS codes found in {url}")
+    except Exception:
+        os.remove(partial)
+        raise
+    os.replace(partial, path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Download the USITC tariff schedule the app checks HTS codes against")
+    parser.add_argument("--url", default=HTS_EXPORT_URL)
+    parser.add_argument("--output", default=HTS_SCHEDULE_PATH)
+    args = parser.parse_args()
+    index = fetch_schedule(args.url, args.output)
+    print(f"Saved {len(index)} HTS codes to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
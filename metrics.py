@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+# Individual operations kept for the admin performance panel
+RECENT_OPERATIONS = 500
+
+# How often the metrics file is rewritten
+METRICS_FILE_INTERVAL_SECONDS = 15
+
+# Labels attached to everything recorded in the current script run
+_labels = ContextVar("metric_labels", default={})
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# --- Operation timings ---
+# Every operation is counted into a histogram per (operation, vendor) for the
+# Prometheus text output, and kept individually in a short ring buffer so the
+# slowest recent calls can be listed with their labels.
+class Metrics:
+    def __init__(self, recent=RECENT_OPERATIONS):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._recent = deque(maxlen=recent)
+
+    def record(self, operation, seconds, rows=None, error=None, **labels):
+        labels = {**_labels.get(), **labels}
+        vendor = labels.pop("vendor", "")
+        with self._lock:
+            series = self._series.get((operation, vendor))
+            if series is None:
+                series = self._series[(operation, vendor)] = {
+                    "count": 0, "errors": 0, "seconds": 0.0, "rows": 0, "buckets": [0] * len(LATENCY_BUCKETS)
+                }
+            series["count"] += 1
+            series["seconds"] += seconds
+            series["rows"] += rows or 0
+            if error is not None:
+                series["errors"] += 1
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    series["buckets"][i] += 1
+
+            self._recent.append({
+                "operation": operation,
+                "vendor": vendor,
+                "rows": rows,
+                "seconds": seconds,
+                "error": error,
+                "at": time.time(),
+                "labels": labels
+            })
+
+    @contextmanager
+    def timed(self, operation, **labels):
+        # Yields the labels dict, so "rows" can be filled in once it is known
+        op = dict(labels)
+        started = time.perf_counter()
+        error = None
+        try:
+            yield op
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            # Streamlit's rerun and stop exceptions are not errors, so only Exception is
+            self.record(operation, time.perf_counter() - started, error=error, **op)
+
+    def slowest(self, limit=20):
+        with self._lock:
+            recent = list(self._recent)
+        return sorted(recent, key=lambda op: op["seconds"], reverse=True)[:limit]
+
+    def summary(self):
+        # Totals per operation across vendors
+        totals = {}
+        with self._lock:
+            for (operation, _), series in self._series.items():
+                total = totals.setdefault(operation, {"count": 0, "errors": 0, "seconds": 0.0, "rows": 0})
+                for key in total:
+                    total[key] += series[key]
+        return totals
+
+    def prometheus_text(self):
+        with self._lock:
+            series = {key: {**value, "buckets": list(value["buckets"])} for key, value in self._series.items()}
+
+        lines = [
+            "# HELP s1_operation_seconds Time spent in external calls and page phases.",
+            "# TYPE s1_operation_seconds histogram"
+        ]
+        for (operation, vendor), values in sorted(series.items()):
+            labels = f'operation="{escape_label(operation)}",vendor="{escape_label(vendor)}"'
+            for bound, count in zip(LATENCY_BUCKETS, values["buckets"]):
+                lines.append(f's1_operation_seconds_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f's1_operation_seconds_bucket{{{labels},le="+Inf"}} {values["count"]}')
+            lines.append(f"s1_operation_seconds_sum{{{labels}}} {values['seconds']:.6f}")
+            lines.append(f"s1_operation_seconds_count{{{labels}}} {values['count']}")
+
+        for name, key, help_text in [
+            ("s1_operation_errors_total", "errors", "Operations that raised an exception."),
+            ("s1_operation_rows_total", "rows", "Rows read, written or rendered by operations.")
+        ]:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for (operation, vendor), values in sorted(series.items()):
+                lines.append(
+                    f'{name}{{operation="{escape_label(operation)}",vendor="{escape_label(vendor)}"}} {values[key]}'
+                )
+        return "\n".join(lines) + "\n"
+
+
+# --- Metrics file for a Prometheus textfile collector ---
+class MetricsFileWriter:
+    def __init__(self, metrics, path, interval=METRICS_FILE_INTERVAL_SECONDS):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._thread = threading.Thread(target=self._run, name="metrics-file-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def write(self):
+        # Written beside the target and renamed, so scrapers never see half a file
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.metrics.prometheus_text())
+        os.replace(tmp_path, self.path)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.write()
+            except OSError:
+                pass
+
+
+# Process-wide registry shared by the app and its storage, queue and image modules
+registry = Metrics()
+timed = registry.timed
+record = registry.record
+
+
+@contextmanager
+def labels(**values):
+    # Labels every operation recorded inside the block, e.g. the vendor being served
+    token = _labels.set({**_labels.get(), **values})
+    try:
+        yield
+    finally:
+        _labels.reset(token)
@@ -0,0 +1,113 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+UNASSIGNED_OWNER = "Unassigned"
+
+
+# --- Completion flag, computed once per row ---
+def completion_flags(df):
+    # An item is complete only when both Country of Origin and HTS Code are filled
+    country = df["CountryofOrigin"]
+    hts = df["HTSCode"]
+    return (country.notna() & (country != "")) & (hts.notna() & (hts != ""))
+
+
+def is_complete(country, hts):
+    # completion_flags for a single row
+    return not pd.isna(country) and country != "" and not pd.isna(hts) and hts != ""
+
+
+def owner_labels(df):
+    if "TaxPathOwner" in df.columns:
+        return df["TaxPathOwner"].astype(object).fillna("").astype(str).replace("", UNASSIGNED_OWNER)
+    return pd.Series(UNASSIGNED_OWNER, index=df.index)
+
+
+# --- Roll-ups of the owner x vendor completion matrix ---
+def rollup(matrix, by):
+    totals = matrix.groupby(by, sort=False, dropna=False, observed=True)[["total_items", "completed_items"]].sum().reset_index()
+    totals["completion_percentage"] = totals["completed_items"] / totals["total_items"] * 100
+    return totals.sort_values("completion_percentage", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# --- Completion counters kept current as writes land ---
+# Built in one pass when a snapshot loads, then adjusted only for the rows a
+# write changes, so the vendor gauge and admin charts read counts instead of
+# rescanning the sheet, and see every session's writes as they commit.
+class CompletionCounters:
+    def __init__(self, df, flags=None):
+        # flags may come precomputed from a streamed load
+        self._lock = threading.Lock()
+        if flags is None:
+            flags = completion_flags(df)
+        self.flags = np.asarray(flags, dtype=bool).copy()
+
+        # One code per owner x vendor cell of the admin matrix
+        owner_codes, owners = pd.factorize(owner_labels(df))
+        vendor_codes, vendors = pd.factorize(df["PrimaryVendorName"].astype(object).fillna(""))
+        width = max(len(vendors), 1)
+        self._cell_codes, cells = pd.factorize(owner_codes.astype(np.int64) * width + vendor_codes)
+        self._cell_owners = np.asarray(owners, dtype=object)[cells // width]
+        self._cell_vendors = np.asarray(vendors, dtype=object)[cells % width]
+        self._cell_totals = np.bincount(self._cell_codes, minlength=len(cells))
+        self._cell_completed = np.bincount(self._cell_codes, weights=self.flags, minlength=len(cells)).astype(np.int64)
+
+        # And one per vendor ID, for the vendor gauge
+        self._vendor_codes, vendor_ids = pd.factorize(df["PrimaryVendorNumber"].astype(object).fillna(""))
+        self._vendor_lookup = {vendor_id: code for code, vendor_id in enumerate(vendor_ids)}
+        self._vendor_totals = np.bincount(self._vendor_codes, minlength=len(vendor_ids))
+        self._vendor_completed = np.bincount(self._vendor_codes, weights=self.flags, minlength=len(vendor_ids)).astype(np.int64)
+
+        self._completed = int(self.flags.sum())
+        # Cells changed since changes() was last called
+        self._dirty = set()
+
+    def set_flags(self, positions, flags):
+        # Record the current completion flag of the given rows; only rows whose
+        # flag actually changed move the counts
+        positions = np.asarray(positions, dtype=np.intp)
+        flags = np.asarray(flags, dtype=bool)
+        with self._lock:
+            changed = flags != self.flags[positions]
+            if not changed.any():
+                return
+            rows = positions[changed]
+            delta = np.where(flags[changed], 1, -1)
+            self.flags[rows] = flags[changed]
+            np.add.at(self._cell_completed, self._cell_codes[rows], delta)
+            np.add.at(self._vendor_completed, self._vendor_codes[rows], delta)
+            self._completed += int(delta.sum())
+            self._dirty.update(np.unique(self._cell_codes[rows]).tolist())
+
+    def overall(self):
+        # (completed, total) across the whole sheet
+        return self._completed, len(self.flags)
+
+    def vendor(self, vendor_id):
+        # (completed, total) for one vendor ID
+        code = self._vendor_lookup.get(vendor_id)
+        if code is None:
+            return 0, 0
+        with self._lock:
+            return int(self._vendor_completed[code]), int(self._vendor_totals[code])
+
+    def matrix(self, cells=None):
+        # One row per owner x vendor cell; every admin chart and table is a roll-up of this
+        cells = slice(None) if cells is None else np.asarray(cells, dtype=np.intp)
+        with self._lock:
+            completed = self._cell_completed[cells].copy()
+        return pd.DataFrame({
+            "owner": self._cell_owners[cells],
+            "vendor": self._cell_vendors[cells],
+            "total_items": self._cell_totals[cells],
+            "completed_items": completed
+        })
+
+    def changes(self):
+        # Matrix rows of the cells changed since the last call
+        with self._lock:
+            dirty = sorted(self._dirty)
+            self._dirty.clear()
+        return self.matrix(dirty)
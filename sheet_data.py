@@ -0,0 +1,384 @@
+import threading
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from reporting import CompletionCounters, completion_flags, is_complete
+from sheets_client import SheetsUnavailable
+from storage import FIRST_DATA_ROW
+
+# How long a loaded copy of Sheet1 is served before it is fetched again
+SNAPSHOT_TTL_SECONDS = 300
+
+# Columns the vendor form and admin dashboard read; everything else on the
+# sheet is never downloaded
+VENDOR_COLUMNS = [
+    "SKUID", "SiteOneItemNumber", "ProductName", "Taxonomy", "ImageURL",
+    "PrimaryVendorNumber", "PrimaryVendorName", "CountryofOrigin", "HTSCode"
+]
+ADMIN_COLUMNS = ["PrimaryVendorName", "TaxPathOwner", "CountryofOrigin", "HTSCode"]
+SNAPSHOT_COLUMNS = list(dict.fromkeys(VENDOR_COLUMNS + ADMIN_COLUMNS))
+
+# Columns vendors fill in; the only ones re-read when a vendor's rows are refreshed
+EDITABLE_COLUMNS = ["CountryofOrigin", "HTSCode"]
+
+SKU_NOT_FOUND = "Could not find SKU in the spreadsheet"
+ROWS_MOVED = "The sheet's rows moved before this SKU could be written"
+
+# Low-cardinality text stored once per distinct value, and ID columns stored
+# as the narrowest integer type that holds them
+CATEGORY_COLUMNS = ["PrimaryVendorNumber", "PrimaryVendorName", "Taxonomy", "TaxPathOwner"]
+NUMERIC_ID_COLUMNS = ["SKUID", "SiteOneItemNumber"]
+
+
+def canonical_sku(value):
+    # Sheets hands SKUs back as ints, floats ("1234.0") or zero-padded text
+    text = str(value).strip()
+    if text.endswith(".0"):
+        text = text[:-2]
+    if text.isdigit():
+        return str(int(text))
+    return text
+
+
+def compact_ids(values):
+    # Whole-number IDs become the narrowest integer dtype; a column with any
+    # blank or non-numeric ID is left as it is
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.isna().any() or not (numbers % 1 == 0).all():
+        return values
+    return pd.to_numeric(numbers.astype(np.int64), downcast="integer")
+
+
+def compact_positions(positions):
+    return np.asarray(positions, dtype=np.int32)
+
+
+# --- Frame preparation and vendor slices ---
+def prepare_frame(df):
+    df["PrimaryVendorNumber"] = df["PrimaryVendorNumber"].astype(str).str.strip().str.upper()
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in NUMERIC_ID_COLUMNS:
+        if column in df.columns:
+            df[column] = compact_ids(df[column])
+    # Vendor input is written into these in place, so keep them as plain objects
+    df[EDITABLE_COLUMNS] = df[EDITABLE_COLUMNS].astype(object)
+    return df
+
+
+def combine_chunks(parts):
+    # Concatenates prepared chunks column by column. Categories are unioned so
+    # the columns stay categorical; IDs are compacted again because a chunk
+    # may have needed a wider type, or kept blanks, that the others did not.
+    if not parts:
+        return pd.DataFrame()
+    columns = {}
+    for column in parts[0].columns:
+        pieces = [part[column] for part in parts]
+        if column in CATEGORY_COLUMNS:
+            columns[column] = pd.Series(union_categoricals(pieces, sort_categories=True))
+        else:
+            columns[column] = pd.concat(pieces, ignore_index=True)
+            if column in NUMERIC_ID_COLUMNS:
+                columns[column] = compact_ids(columns[column])
+    df = pd.DataFrame(columns)
+    df[EDITABLE_COLUMNS] = df[EDITABLE_COLUMNS].astype(object)
+    return df
+
+
+def stream_frame(chunks):
+    # Builds the snapshot frame from row-range chunks of raw cells. Each chunk
+    # is typed, flagged complete or not, and grouped by vendor as it arrives,
+    # so only one chunk of raw values is alive at a time. Returns the frame
+    # and the per-row flags and vendor positions for SheetSnapshot.
+    parts = []
+    flags = []
+    vendor_parts = {}
+    offset = 0
+    for chunk in chunks:
+        chunk = prepare_frame(chunk)
+        flags.append(completion_flags(chunk).to_numpy(dtype=bool))
+        for vendor_id, positions in chunk.groupby("PrimaryVendorNumber", sort=False, observed=True).indices.items():
+            vendor_parts.setdefault(vendor_id, []).append(positions + offset)
+        offset += len(chunk)
+        parts.append(chunk)
+
+    df = combine_chunks(parts)
+    del parts
+    return df, {
+        "flags": np.concatenate(flags) if flags else np.zeros(0, dtype=bool),
+        "vendor_positions": {vendor_id: np.concatenate(pieces) for vendor_id, pieces in vendor_parts.items()}
+    }
+
+
+def incomplete_positions(df, positions):
+    # Positions of the rows still missing Country of Origin or HTS Code, in display order
+    items = df.iloc[positions]
+    pending = ~completion_flags(items).to_numpy()
+    order = items.loc[pending, ["Taxonomy", "SiteOneItemNumber"]].assign(position=positions[pending])
+    return compact_positions(order.sort_values(by=["Taxonomy", "SiteOneItemNumber"])["position"])
+
+
+# --- One session's rows of the shared snapshot ---
+class VendorRows:
+    # Sessions keep the positions of their vendor's pending rows rather than a
+    # copy of the rows. The SKUs are kept alongside so the positions can be
+    # found again if the snapshot is replaced by a full reload.
+    def __init__(self, snapshot, positions):
+        self.positions = compact_positions(positions)
+        self.skus = snapshot.df["SKUID"].to_numpy()[self.positions]
+        self._snapshot = weakref.ref(snapshot)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _rebase(self, snapshot):
+        if self._snapshot() is snapshot:
+            return
+        found = [snapshot.index.position(sku) for sku in self.skus]
+        kept = np.array([position is not None for position in found], dtype=bool)
+        self.positions = compact_positions([position for position in found if position is not None])
+        self.skus = self.skus[kept]
+        self._snapshot = weakref.ref(snapshot)
+
+    def remaining(self, snapshot, submitted_skus):
+        # SKUs and snapshot positions of the rows not yet submitted in this
+        # session; submitted_skus holds canonical SKUs
+        self._rebase(snapshot)
+        skus = [str(sku) for sku in self.skus]
+        unsubmitted = np.array([canonical_sku(sku) not in submitted_skus for sku in skus], dtype=bool)
+        return [sku for sku, keep in zip(skus, unsubmitted) if keep], self.positions[unsubmitted]
+
+
+# --- SKU and vendor lookups built once per load ---
+class SheetIndex:
+    def __init__(self, df, vendor_positions=None):
+        self._positions = {}
+        for position, sku in enumerate(df["SKUID"].map(canonical_sku)):
+            # Keep the first occurrence, matching the old col_values().index() lookup
+            self._positions.setdefault(sku, position)
+        # A streamed load has already grouped the rows by vendor
+        if vendor_positions is None:
+            vendor_positions = df.groupby("PrimaryVendorNumber", sort=False, observed=True).indices
+        self._vendor_positions = vendor_positions
+
+    def position(self, sku):
+        return self._positions.get(canonical_sku(sku))
+
+    def row_number(self, sku):
+        position = self.position(sku)
+        return None if position is None else position + FIRST_DATA_ROW
+
+    def vendor_positions(self, vendor_id):
+        return self._vendor_positions.get(vendor_id, np.empty(0, dtype=np.intp))
+
+
+# --- Snapshot of Sheet1 shared by every session ---
+class SheetSnapshot:
+    def __init__(self, df, headers, backend, version, change_token=None, flags=None, vendor_positions=None):
+        self.df = df
+        self.headers = headers
+        self.backend = backend
+        self.version = version
+        # Cheap "has the sheet moved" signal captured when the data was read
+        self.change_token = change_token
+        self.loaded_at = time.time()
+        self.vendor_loaded_at = {}
+        self.index = SheetIndex(df, vendor_positions)
+        self.progress = CompletionCounters(df, flags)
+
+    def is_fresh(self, version, ttl):
+        return self.version == version and time.time() - self.loaded_at < ttl
+
+    def is_vendor_fresh(self, vendor_id, version, ttl):
+        if self.is_fresh(version, ttl):
+            return True
+        return self.version == version and time.time() - self.vendor_loaded_at.get(vendor_id, 0) < ttl
+
+    def refresh_vendor(self, vendor_id):
+        # Re-read just this vendor's editable cells. Returns False if the sheet's
+        # rows have moved since the index was built, so a full reload is needed.
+        positions = self.index.vendor_positions(vendor_id)
+        if len(positions) == 0:
+            return False
+
+        rows = self.backend.read_rows(self.headers, positions + FIRST_DATA_ROW, ["SKUID"] + EDITABLE_COLUMNS)
+        expected = self.df["SKUID"].iloc[positions].map(canonical_sku).tolist()
+        if rows["SKUID"].map(canonical_sku).tolist() != expected:
+            return False
+
+        for column in EDITABLE_COLUMNS:
+            self.df.iloc[positions, self.df.columns.get_loc(column)] = rows[column].to_numpy(dtype=object)
+        self.progress.set_flags(positions, completion_flags(rows))
+        self.vendor_loaded_at[vendor_id] = time.time()
+        return True
+
+    def write(self, updates):
+        # updates maps SKU -> {column: value}; returns SKU -> None or an error.
+        # Row numbers can be a TTL old, so the SKU cells of the target rows are
+        # read back first; rows a sort, insert or delete has moved are not
+        # written and come back as ROWS_MOVED.
+        results = {}
+        rows = {}
+        for sku, values in updates.items():
+            row = self.index.row_number(sku)
+            if row is None:
+                results[sku] = SKU_NOT_FOUND
+            else:
+                rows[sku] = (row, values)
+        for sku in self.moved(rows):
+            results[sku] = ROWS_MOVED
+            del rows[sku]
+        results.update(self.backend.write_rows(self.headers, rows))
+        return results
+
+    def moved(self, rows):
+        # SKUs of rows (SKU -> (sheet row, values)) whose row no longer holds them
+        if not rows:
+            return []
+        ordered = sorted(rows, key=lambda sku: rows[sku][0])
+        cells = self.backend.read_rows(self.headers, [rows[sku][0] for sku in ordered], ["SKUID"])["SKUID"]
+        return [sku for sku, cell in zip(ordered, cells) if canonical_sku(cell) != canonical_sku(sku)]
+
+    def apply(self, sku, values):
+        position = self.index.position(sku)
+        if position is None:
+            return False
+        for column, value in values.items():
+            self.df.iat[position, self.df.columns.get_loc(column)] = value
+        self.progress.set_flags([position], [is_complete(
+            self.df.iat[position, self.df.columns.get_loc("CountryofOrigin")],
+            self.df.iat[position, self.df.columns.get_loc("HTSCode")]
+        )])
+        return True
+
+
+# --- Process-wide cache keyed by data version ---
+class SnapshotCache:
+    def __init__(self, ttl=SNAPSHOT_TTL_SECONDS, on_load=None):
+        # on_load runs against each freshly fetched snapshot before it is shared
+        self.ttl = ttl
+        self.on_load = on_load
+        self._version = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @property
+    def version(self):
+        return self._version
+
+    def current(self):
+        # The latest snapshot as it stands, with no freshness check; for reading
+        # rows a session already holds positions for
+        return self._snapshot
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        return None
+
+    def _revalidate(self, snapshot):
+        # An expired snapshot is renewed for another TTL if the sheet has not
+        # changed since it was read
+        if snapshot.change_token is None:
+            return False
+        try:
+            unchanged = snapshot.backend.change_token() == snapshot.change_token
+        except Exception:
+            return False
+        if unchanged:
+            snapshot.loaded_at = time.time()
+            snapshot.vendor_loaded_at.clear()
+        return unchanged
+
+    def _load(self, loader):
+        loaded = loader()
+        if loaded is None:
+            return None
+
+        # streamed holds what stream_frame computed while the rows arrived
+        df, headers, backend, change_token, streamed = loaded
+        snapshot = SheetSnapshot(df, headers, backend, self._version, change_token, **streamed)
+        if self.on_load is not None:
+            self.on_load(snapshot)
+        self._snapshot = snapshot
+        return snapshot
+
+    def get(self, loader):
+        # Only the first caller after a version bump or TTL expiry pays for
+        # the fetch; concurrent callers wait on the lock and reuse its result.
+        with self._lock:
+            snapshot = self._current()
+            if snapshot is None:
+                return self._load(loader)
+            if snapshot.is_fresh(self._version, self.ttl) or self._revalidate(snapshot):
+                return snapshot
+            try:
+                return self._load(loader)
+            except SheetsUnavailable:
+                # Serve the last snapshot, however old, until the API recovers
+                return snapshot
+
+    def get_vendor(self, vendor_id, loader):
+        # A stale snapshot that already indexes this vendor only needs the
+        # vendor's own rows re-read, not the whole sheet
+        with self._lock:
+            snapshot = self._current()
+            if snapshot is None:
+                return self._load(loader)
+            if snapshot.is_vendor_fresh(vendor_id, self._version, self.ttl) or self._revalidate(snapshot):
+                return snapshot
+            try:
+                if snapshot.refresh_vendor(vendor_id):
+                    if self.on_load is not None:
+                        self.on_load(snapshot)
+                    return snapshot
+                return self._load(loader)
+            except SheetsUnavailable:
+                return snapshot
+
+    def write(self, updates, loader):
+        # Writes through the current snapshot. Rows that moved since it was
+        # loaded are found again on a fresh load and written once more; any
+        # still failing are left for the caller to retry. None if Sheet1 is
+        # unavailable.
+        snapshot = self.get(loader)
+        if snapshot is None:
+            return None
+        results = snapshot.write(updates)
+        moved = {sku: updates[sku] for sku, error in results.items() if error == ROWS_MOVED}
+        if not moved:
+            return results
+
+        try:
+            with self._lock:
+                snapshot = self._load(loader)
+        except SheetsUnavailable:
+            return results
+        if snapshot is not None:
+            results.update(snapshot.write(moved))
+        return results
+
+    def apply_write(self, sku, values):
+        # Fold a committed write into the shared snapshot so other sessions
+        # see it without refetching the whole sheet
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or not snapshot.apply(sku, values):
+                return
+            self._version += 1
+            snapshot.version = self._version
+
+    def expire(self):
+        # Force the next read to check the sheet; it only reloads if the sheet changed
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot.loaded_at = 0
+                self._snapshot.vendor_loaded_at.clear()
+
@@ -0,0 +1,176 @@
+import random
+import threading
+import time
+
+import requests
+
+import metrics
+
+# Google Sheets allows 60 read and 60 write requests per minute per user, and
+# the app's service account counts as one user
+READS_PER_MINUTE = 60
+WRITES_PER_MINUTE = 60
+
+# Share of the per-minute quota that may go out in one burst
+BURST_SHARE = 0.1
+
+# A request that would wait longer than this for quota fails instead
+ACQUIRE_TIMEOUT_SECONDS = 20
+
+# Retry schedule for 429 and 5xx responses: 0.5s, 1s, 2s, 4s with jitter
+MAX_RETRIES = 4
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 16
+
+# Consecutive failed requests that open the circuit, and how long it stays open
+BREAKER_FAILURES = 5
+BREAKER_OPEN_SECONDS = 30
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class SheetsUnavailable(Exception):
+    # The API is throttled or failing; readers fall back to the cached snapshot
+    pass
+
+
+def is_transient(error):
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    # gspread's APIError (and the local stand-in's quota error) carry the HTTP status as .code
+    return getattr(error, "code", None) in RETRYABLE_STATUS_CODES
+
+
+def retry_delay(error, attempt):
+    # Google's Retry-After wins when it sends one
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        return min(RETRY_MAX_SECONDS, int(retry_after))
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+# --- Process-wide request budget ---
+class TokenBucket:
+    def __init__(self, per_minute):
+        # The burst plus a minute of refill never exceeds per_minute
+        self.capacity = max(1.0, per_minute * BURST_SHARE)
+        self.rate = max(1.0, per_minute - self.capacity) / 60
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout):
+        # Reserves a slot and sleeps until it comes up; returns the wait, or
+        # None without waiting if the slot is more than timeout away
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+            if wait > timeout:
+                return None
+            self._tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+# --- Stop calling an API that keeps failing ---
+# failure() is called once per request that gave up, not once per attempt
+class CircuitBreaker:
+    def __init__(self, failures=BREAKER_FAILURES, open_seconds=BREAKER_OPEN_SECONDS):
+        self.failures = failures
+        self.open_seconds = open_seconds
+        self._count = 0
+        self._opened_at = None
+        # Thread running the half-open probe, if any
+        self._probe = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.open_seconds or self._probe is not None:
+                return False
+            # Half open: one request goes through to see whether the API has recovered
+            self._probe = threading.get_ident()
+            return True
+
+    def is_probe(self):
+        # Whether the calling thread holds the half-open probe
+        return self._probe == threading.get_ident()
+
+    def release(self):
+        # Gives up this thread's probe without a verdict, e.g. when it could not
+        # get quota, so the next request can probe instead
+        with self._lock:
+            if self._probe == threading.get_ident():
+                self._probe = None
+
+    def success(self):
+        with self._lock:
+            self._count = 0
+            self._opened_at = None
+            self._probe = None
+
+    def failure(self):
+        with self._lock:
+            self._count += 1
+            if self._probe is not None or self._count >= self.failures:
+                if self._opened_at is None:
+                    metrics.record("sheets.circuit_open", 0)
+                self._opened_at = time.monotonic()
+                self._probe = None
+
+
+# --- Shared wrapper every Sheets request goes through ---
+class SheetsClient:
+    def __init__(self, read_per_minute=READS_PER_MINUTE, write_per_minute=WRITES_PER_MINUTE,
+                 max_retries=MAX_RETRIES, acquire_timeout=ACQUIRE_TIMEOUT_SECONDS):
+        # Requests of other kinds (Drive metadata) are not counted against the Sheets quota
+        self.buckets = {"read": TokenBucket(read_per_minute), "write": TokenBucket(write_per_minute)}
+        self.max_retries = max_retries
+        self.acquire_timeout = acquire_timeout
+        self.breaker = CircuitBreaker()
+
+    def call(self, kind, fn, *args, **kwargs):
+        for attempt in range(1, self.max_retries + 2):
+            if not self.breaker.allow():
+                raise SheetsUnavailable("Google Sheets is failing; requests are paused for a moment")
+
+            bucket = self.buckets.get(kind)
+            if bucket is not None:
+                waited = bucket.acquire(self.acquire_timeout)
+                if waited is None:
+                    # Quota says nothing about the API's health
+                    self.breaker.release()
+                    raise SheetsUnavailable(f"Google Sheets {kind} quota is used up; try again shortly")
+                if waited:
+                    metrics.record("sheets.throttled", waited)
+
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_transient(e):
+                    # The API answered, it just did not like the request
+                    self.breaker.success()
+                    raise
+                # One failure per request once its retries are used up; a failed
+                # probe reopens the circuit without retrying
+                if attempt > self.max_retries or self.breaker.is_probe():
+                    self.breaker.failure()
+                    raise SheetsUnavailable(f"Google Sheets request failed after {attempt} attempts: {e}") from e
+                delay = retry_delay(e, attempt)
+                metrics.record("sheets.retry", delay, error=type(e).__name__)
+                time.sleep(delay)
+                continue
+
+            self.breaker.success()
+            return result
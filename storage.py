@@ -0,0 +1,326 @@
+import functools
+import re
+import threading
+import time
+from collections import Counter, deque
+
+import pandas as pd
+from gspread.utils import a1_to_rowcol, numericise_all, rowcol_to_a1
+
+import metrics
+
+# Rows sent per batch_update request when writing many submissions at once
+WRITE_BATCH_ROWS = 200
+
+# Ranges sent per batch_get request (each range is a URL parameter)
+READ_BATCH_RANGES = 100
+
+# Row 1 holds the headers, so the first record lives on sheet row 2
+FIRST_DATA_ROW = 2
+
+# Sheet rows fetched per request when the whole sheet is loaded
+LOAD_CHUNK_ROWS = 50_000
+
+# Columns read as the text they hold. HTS codes and SKUs can be all digits
+# with leading zeros that number parsing would drop, and a column mixing
+# numbers with text cannot be converted for st.dataframe.
+TEXT_COLUMNS = ["SKUID", "CountryofOrigin", "HTSCode"]
+
+
+def column_letter(column_number):
+    return re.sub(r"\d", "", rowcol_to_a1(1, column_number))
+
+
+def row_runs(row_numbers):
+    # Collapse row numbers into (first, last) runs of consecutive rows
+    runs = []
+    for row in sorted(row_numbers):
+        if runs and row == runs[-1][1] + 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+    return runs
+
+
+def sheets_call(kind):
+    # Times and counts each Sheets request as "sheets.<method>", and sends it
+    # through the backend's SheetsClient (quota, retries, circuit breaker) if it has one
+    def decorate(method):
+        operation = f"sheets.{method.__name__}"
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with metrics.timed(operation):
+                if self.client is None:
+                    return method(self, *args, **kwargs)
+                return self.client.call(kind, method, self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def to_column(value_range, length, numeric=True):
+    # Sheets trims trailing blank cells and rows from each range
+    values = [row[0] if row else "" for row in value_range]
+    values += [""] * (length - len(values))
+    if not numeric:
+        return values
+    # Same number parsing get_all_records applies
+    return numericise_all(values, default_blank="")
+
+
+# --- Storage interface ---
+# Backends provide five Sheets-shaped primitives; loading, row reads and
+# batched writes are built on top of them so every backend is called the
+# same way the real API is.
+class SheetBackend:
+    client = None
+
+    def change_token(self):
+        raise NotImplementedError
+
+    def header_row(self):
+        raise NotImplementedError
+
+    def row_count(self):
+        # Rows in the grid, header included; no range may start past it
+        raise NotImplementedError
+
+    def batch_get(self, ranges):
+        raise NotImplementedError
+
+    def batch_update(self, data):
+        raise NotImplementedError
+
+    def get_ranges(self, ranges):
+        value_ranges = []
+        for start in range(0, len(ranges), READ_BATCH_RANGES):
+            value_ranges.extend(self.batch_get(ranges[start:start + READ_BATCH_RANGES]))
+        return value_ranges
+
+    def load(self, columns, chunk_rows=LOAD_CHUNK_ROWS):
+        # Token is taken before reading so edits made during the read trigger the
+        # next reload. The rows come back as a lazy iterator of chunks.
+        change_token = self.change_token()
+        headers = self.header_row()
+        row_count = self.row_count()
+        return self.read_column_chunks(headers, columns, row_count, chunk_rows), headers, change_token
+
+    def read_column_chunks(self, headers, columns, row_count, chunk_rows=LOAD_CHUNK_ROWS):
+        # Whole-sheet read of only the named columns, one row range at a time, so
+        # the raw cell values of only one chunk are held at once. Ranges stop at
+        # the grid's last row, as Sheets rejects ones that start past it. Sheets
+        # trims trailing blank rows from each range, so blank rows are held back
+        # and emitted only once a later row has data: gaps keep their rows and
+        # positions, and blank rows at the end of the sheet are dropped, as
+        # get_all_records does.
+        present = [column for column in columns if column in headers]
+        letters = [column_letter(headers.index(column) + 1) for column in present]
+        first = FIRST_DATA_ROW
+        blank_rows = 0
+        while first <= row_count:
+            last = min(first + chunk_rows - 1, row_count)
+            value_ranges = self.get_ranges([f"{letter}{first}:{letter}{last}" for letter in letters])
+            length = max((len(value_range) for value_range in value_ranges), default=0)
+            if length:
+                if blank_rows:
+                    yield pd.DataFrame({column: [""] * blank_rows for column in present})
+                    blank_rows = 0
+                yield pd.DataFrame({
+                    column: to_column(value_range, length, column not in TEXT_COLUMNS)
+                    for column, value_range in zip(present, value_ranges)
+                })
+            del value_ranges
+            blank_rows += last - first + 1 - length
+            first = last + 1
+
+    def read_rows(self, headers, row_numbers, columns):
+        # Read only the given sheet rows of the named columns, one range per run of rows
+        runs = row_runs(row_numbers)
+        letters = [column_letter(headers.index(column) + 1) for column in columns]
+        value_ranges = iter(self.get_ranges([
+            f"{letter}{first}:{letter}{last}" for first, last in runs for letter in letters
+        ]))
+
+        data = {column: [] for column in columns}
+        for first, last in runs:
+            for column in columns:
+                data[column].extend(to_column(next(value_ranges), last - first + 1, column not in TEXT_COLUMNS))
+        return pd.DataFrame(data)
+
+    def write_rows(self, headers, rows):
+        # rows maps key -> (sheet row, {column: value}); returns key -> None, or
+        # the exception its batch raised so callers can tell throttling from a bad request
+        results = {}
+        located = list(rows.items())
+        for start in range(0, len(located), WRITE_BATCH_ROWS):
+            chunk = located[start:start + WRITE_BATCH_ROWS]
+            data = [
+                {"range": rowcol_to_a1(row, headers.index(column) + 1), "values": [[value]]}
+                for _, (row, values) in chunk
+                for column, value in values.items()
+            ]
+            try:
+                self.batch_update(data)
+                error = None
+            except Exception as e:
+                error = e
+            for key, _ in chunk:
+                results[key] = error
+        return results
+
+
+# --- Google Sheets ---
+class GspreadBackend(SheetBackend):
+    def __init__(self, worksheet, client=None):
+        self.worksheet = worksheet
+        self.client = client
+
+    @sheets_call("metadata")
+    def change_token(self):
+        # One small Drive metadata request instead of re-downloading the sheet
+        return self.worksheet.spreadsheet.get_lastUpdateTime()
+
+    @sheets_call("read")
+    def header_row(self):
+        return self.worksheet.row_values(1)
+
+    @sheets_call("read")
+    def row_count(self):
+        # From fresh metadata: worksheet.row_count is as old as the cached handle
+        metadata = self.worksheet.spreadsheet.fetch_sheet_metadata()
+        for sheet in metadata["sheets"]:
+            if sheet["properties"]["sheetId"] == self.worksheet.id:
+                return sheet["properties"]["gridProperties"]["rowCount"]
+        return self.worksheet.row_count
+
+    @sheets_call("read")
+    def batch_get(self, ranges):
+        return self.worksheet.batch_get(ranges)
+
+    @sheets_call("write")
+    def batch_update(self, data):
+        self.worksheet.batch_update(data, value_input_option="USER_ENTERED")
+
+
+# --- In-memory stand-in for offline benchmarks and load tests ---
+class SheetQuotaError(Exception):
+    # Mirrors the HTTP status gspread's APIError exposes as .code
+    code = 429
+
+
+class SheetRangeError(Exception):
+    # Sheets answers a read that starts past the last row with a 400
+    code = 400
+
+
+class LocalSheetBackend(SheetBackend):
+    # Calls made by every instance in the process; load tests read this because
+    # the app under test creates its own backend
+    total_calls = Counter()
+
+    def __init__(self, rows, latency=0.0, read_quota=None, write_quota=None, client=None):
+        # rows includes the header row; quotas are requests per rolling minute
+        self.rows = [["" if value is None else str(value) for value in row] for row in rows]
+        self.latency = latency
+        self.quotas = {"read": read_quota, "write": write_quota}
+        self.client = client
+        self.calls = Counter()
+        self._recent = {"read": deque(), "write": deque()}
+        self._modified = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df, **kwargs):
+        values = df.astype(object).where(df.notna(), "").values.tolist()
+        return cls([list(df.columns)] + values, **kwargs)
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        return cls.from_frame(pd.read_csv(path, dtype=str, keep_default_na=False), **kwargs)
+
+    def _call(self, name, kind):
+        with self._lock:
+            self.calls[name] += 1
+            LocalSheetBackend.total_calls[name] += 1
+            quota = self.quotas[kind]
+            if quota is not None:
+                now = time.time()
+                recent = self._recent[kind]
+                while recent and now - recent[0] >= 60:
+                    recent.popleft()
+                if len(recent) >= quota:
+                    raise SheetQuotaError(f"Quota exceeded for {kind} requests per minute")
+                recent.append(now)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _bounds(self, a1_range):
+        # Accepts "K5", "K5:L9" and open-ended column ranges such as "K2:K"
+        start, _, end = a1_range.partition(":")
+        first_row, first_col = a1_to_rowcol(start)
+        if not end:
+            return first_row, first_col, first_row, first_col
+        if end.isalpha():
+            return first_row, first_col, len(self.rows), a1_to_rowcol(f"{end}1")[1]
+        last_row, last_col = a1_to_rowcol(end)
+        return first_row, first_col, last_row, last_col
+
+    @sheets_call("metadata")
+    def change_token(self):
+        self._call("change_token", "read")
+        return self._modified
+
+    @sheets_call("read")
+    def header_row(self):
+        self._call("header_row", "read")
+        with self._lock:
+            return list(self.rows[0])
+
+    @sheets_call("read")
+    def row_count(self):
+        self._call("row_count", "read")
+        with self._lock:
+            return len(self.rows)
+
+    @sheets_call("read")
+    def batch_get(self, ranges):
+        self._call("batch_get", "read")
+        value_ranges = []
+        with self._lock:
+            for a1_range in ranges:
+                first_row, first_col, last_row, last_col = self._bounds(a1_range)
+                if first_row > len(self.rows):
+                    raise SheetRangeError(f"Range ({a1_range}) exceeds grid limits. Max rows: {len(self.rows)}")
+                value_range = []
+                for row in self.rows[first_row - 1:last_row]:
+                    cells = row[first_col - 1:last_col]
+                    while cells and cells[-1] == "":
+                        cells.pop()
+                    value_range.append(cells)
+                while value_range and not value_range[-1]:
+                    value_range.pop()
+                value_ranges.append(value_range)
+        return value_ranges
+
+    @sheets_call("write")
+    def batch_update(self, data):
+        self._call("batch_update", "write")
+        with self._lock:
+            for update in data:
+                first_row, first_col, _, _ = self._bounds(update["range"])
+                for i, values in enumerate(update["values"]):
+                    while len(self.rows) < first_row + i:
+                        self.rows.append([""] * len(self.rows[0]))
+                    row = self.rows[first_row - 1 + i]
+                    for j, value in enumerate(values):
+                        while len(row) < first_col + j:
+                            row.append("")
+                        # USER_ENTERED: a leading apostrophe only marks the value as text
+                        text = str(value)
+                        row[first_col - 1 + j] = text[1:] if text.startswith("'") else text
+            self._modified += 1
+
+    def touch(self):
+        # Simulates an edit made directly in the sheet by someone else
+        with self._lock:
+            self._modified += 1
@@ -0,0 +1,268 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import metrics
+from sheet_data import SKU_NOT_FOUND, canonical_sku
+from sheets_client import SheetsUnavailable, is_transient
+
+# Retry schedule for submissions the sheet rejected: 2s, 4s, 8s ... capped at 5 min
+RETRY_BASE_SECONDS = 2
+RETRY_MAX_SECONDS = 300
+
+# How often the flusher wakes on its own, and how long it waits after a
+# submit so a burst of rows goes out in one batch
+FLUSH_INTERVAL_SECONDS = 5
+COALESCE_SECONDS = 0.5
+
+# Upper bound on rows handed to the sheet writer per flush
+FLUSH_BATCH_ROWS = 1000
+
+# Non-transient failures before a row is set aside. Throttling and outages
+# never use these up; those rows keep retrying at the capped backoff.
+MAX_ATTEMPTS = 8
+
+
+class Rejected(str):
+    # Error message a writer returns for a row no retry will fix, such as a SKU
+    # that is no longer on the sheet; the row is set aside at once
+    pass
+
+
+def uses_attempt(error):
+    # Writers report a row as an error message (retried as it is), Rejected,
+    # or the exception its write raised. Only exceptions the API would raise
+    # again unchanged, such as a 400, count toward MAX_ATTEMPTS.
+    return isinstance(error, Exception) and not isinstance(error, SheetsUnavailable) and not is_transient(error)
+
+
+def retry_delay(attempts):
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+# --- Durable journal of vendor submissions ---
+# Rows that used up their attempts stay in the table, out of due() and
+# pending(), until an admin retries them or the vendor resubmits. retries
+# counts every failure and sets the backoff; attempts counts only those that
+# use_attempt() says a retry will not fix.
+class SubmissionJournal:
+    def __init__(self, path, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS submissions (
+                    sku TEXT PRIMARY KEY,
+                    vendor_id TEXT NOT NULL,
+                    sheet_values TEXT NOT NULL,
+                    submitted_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    last_error TEXT,
+                    retries INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            # Journals written before retries was split out of attempts
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+            if "retries" not in columns:
+                conn.execute("ALTER TABLE submissions ADD COLUMN retries INTEGER NOT NULL DEFAULT 0")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def enqueue(self, vendor_id, submissions):
+        # One row per SKU: a resubmission replaces whatever is still pending
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("""
+                INSERT INTO submissions (sku, vendor_id, sheet_values, submitted_at, attempts, next_attempt_at)
+                VALUES (?, ?, ?, ?, 0, ?)
+                ON CONFLICT(sku) DO UPDATE SET
+                    vendor_id = excluded.vendor_id,
+                    sheet_values = excluded.sheet_values,
+                    submitted_at = excluded.submitted_at,
+                    attempts = 0,
+                    retries = 0,
+                    next_attempt_at = excluded.next_attempt_at,
+                    last_error = NULL
+            """, [(sku, vendor_id, json.dumps(values), now, now) for sku, values in submissions.items()])
+
+    def pending(self):
+        # Failed rows never reached the sheet, so they are not shown as saved
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT sku, sheet_values FROM submissions WHERE attempts < ?", (self.max_attempts,)
+            ).fetchall()
+        return {sku: json.loads(values) for sku, values in rows}
+
+    def due(self, limit=FLUSH_BATCH_ROWS):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT sku, sheet_values, submitted_at, attempts, retries FROM submissions
+                WHERE attempts < ? AND next_attempt_at <= ?
+                ORDER BY submitted_at
+                LIMIT ?
+            """, (self.max_attempts, time.time(), limit)).fetchall()
+        return [
+            {"sku": sku, "values": json.loads(values), "submitted_at": submitted_at, "attempts": attempts, "retries": retries}
+            for sku, values, submitted_at, attempts, retries in rows
+        ]
+
+    def mark_done(self, entries):
+        # Matching on submitted_at leaves a newer resubmission of the SKU queued
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "DELETE FROM submissions WHERE sku = ? AND submitted_at = ?",
+                [(entry["sku"], entry["submitted_at"]) for entry in entries]
+            )
+
+    def mark_failed(self, entries, error):
+        # A Rejected error uses up every attempt at once; a transient one none
+        now = time.time()
+        rows = []
+        for entry in entries:
+            attempts = entry["attempts"]
+            if isinstance(error, Rejected):
+                attempts = self.max_attempts
+            elif uses_attempt(error):
+                attempts += 1
+            retries = entry["retries"] + 1
+            rows.append((attempts, retries, now + retry_delay(retries), str(error), entry["sku"], entry["submitted_at"]))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("""
+                UPDATE submissions SET attempts = ?, retries = ?, next_attempt_at = ?, last_error = ?
+                WHERE sku = ? AND submitted_at = ?
+            """, rows)
+
+    def failed(self):
+        # Rows set aside after their last attempt, oldest first
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT sku, vendor_id, sheet_values, submitted_at, last_error FROM submissions
+                WHERE attempts >= ?
+                ORDER BY submitted_at
+            """, (self.max_attempts,)).fetchall()
+        return [
+            {"sku": sku, "vendor_id": vendor_id, "values": json.loads(values), "submitted_at": submitted_at, "error": error}
+            for sku, vendor_id, values, submitted_at, error in rows
+        ]
+
+    def retry_failed(self):
+        # Puts every failed row back in the queue with a fresh set of attempts
+        with closing(self._connect()) as conn, conn:
+            return conn.execute(
+                "UPDATE submissions SET attempts = 0, retries = 0, next_attempt_at = ? WHERE attempts >= ?",
+                (time.time(), self.max_attempts)
+            ).rowcount
+
+    def pending_count(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM submissions WHERE attempts < ?", (self.max_attempts,)).fetchone()[0]
+
+
+# --- Background worker that drains the journal into the sheet ---
+class SubmissionFlusher:
+    def __init__(self, journal, writer, interval=FLUSH_INTERVAL_SECONDS):
+        # writer takes {sku: values} and returns {sku: None or an error}; see uses_attempt
+        self.journal = journal
+        self.writer = writer
+        self.interval = interval
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="submission-flusher", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def notify(self):
+        self._wake.set()
+
+    def flush(self):
+        entries = self.journal.due()
+        if not entries:
+            return 0
+
+        try:
+            with metrics.timed("submissions.flush", rows=len(entries)):
+                results = self.writer({entry["sku"]: entry["values"] for entry in entries})
+        except Exception as e:
+            results = {entry["sku"]: e for entry in entries}
+
+        done = []
+        failed = {}
+        for entry in entries:
+            error = results.get(entry["sku"], "No result from sheet writer")
+            if error is None:
+                done.append(entry)
+            else:
+                failed.setdefault(error, []).append(entry)
+        self.journal.mark_done(done)
+        for error, group in failed.items():
+            self.journal.mark_failed(group, error)
+        return len(done)
+
+    def _run(self):
+        while True:
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+                time.sleep(COALESCE_SECONDS)
+            try:
+                self.flush()
+            except Exception:
+                # A broken journal read must not kill the worker; try again next tick
+                pass
+
+
+# --- Submit and flush paths, shared by the app and the load test ---
+def apply_pending_submissions(journal, snapshot):
+    # A fresh fetch may predate queued writes; keep them visible until flushed
+    for sku, values in journal.pending().items():
+        snapshot.apply(sku, values)
+
+
+def queue_submissions(journal, cache, snapshot, vendor_id, submissions, listeners=()):
+    # submissions maps SKU -> validated (country, hts_code); returns SKU ->
+    # error or None. The journal is keyed by canonical SKU, so a row typed in
+    # and the same row uploaded as "00123" are the same item. listeners (the
+    # flusher, the summary writer) are woken once the rows are queued.
+    results = {}
+    queued = {}
+    for sku, (country, hts_code) in submissions.items():
+        if snapshot.index.row_number(sku) is None:
+            results[sku] = SKU_NOT_FOUND
+        else:
+            queued[sku] = {"CountryofOrigin": country, "HTSCode": hts_code}
+
+    # The journal is the commit point; the sheet write happens in the background
+    try:
+        with metrics.timed("submissions.enqueue", rows=len(queued)):
+            journal.enqueue(vendor_id, {canonical_sku(sku): values for sku, values in queued.items()})
+    except Exception as e:
+        results.update({sku: str(e) for sku in queued})
+        return results
+
+    for sku, values in queued.items():
+        cache.apply_write(sku, values)
+        results[sku] = None
+    for listener in listeners:
+        listener.notify()
+    return results
+
+
+def flush_to_sheet(cache, loader, updates):
+    # The flusher's writer. Runs on the flusher thread, so loader must not
+    # make st.* calls.
+    # Add prefix to HTS code to preserve leading zeros
+    results = cache.write({
+        sku: {**values, "HTSCode": f"'{values['HTSCode']}"}
+        for sku, values in updates.items()
+    }, loader)
+    if results is None:
+        return {sku: "Sheet1 is unavailable" for sku in updates}
+    # A SKU that is gone from the sheet will not come back by retrying
+    return {sku: Rejected(error) if error == SKU_NOT_FOUND else error for sku, error in results.items()}
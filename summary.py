@@ -0,0 +1,138 @@
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+import pandas as pd
+
+import metrics
+
+# How often changed cells are written out, and how often the whole summary
+# is rebuilt from a (change-token checked) load of the sheet
+SUMMARY_INTERVAL_SECONDS = 10
+SUMMARY_REBUILD_SECONDS = 900
+
+SUMMARY_COLUMNS = ["owner", "vendor", "total_items", "completed_items"]
+
+
+# --- Materialized owner x vendor summary ---
+# The admin dashboard reads this small table instead of the item sheet; by
+# vendor and by owner are roll-ups of it.
+class SummaryStore:
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS completion_summary (
+                    owner TEXT NOT NULL,
+                    vendor TEXT NOT NULL,
+                    total_items INTEGER NOT NULL,
+                    completed_items INTEGER NOT NULL,
+                    PRIMARY KEY (owner, vendor)
+                )
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS summary_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _rows(self, matrix):
+        return list(zip(
+            matrix["owner"].astype(str), matrix["vendor"].astype(str),
+            matrix["total_items"].astype(int).tolist(), matrix["completed_items"].astype(int).tolist()
+        ))
+
+    def _set_meta(self, conn, **values):
+        conn.executemany(
+            "INSERT INTO summary_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            [(key, str(value)) for key, value in values.items()]
+        )
+
+    def replace(self, matrix, has_owner_column):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM completion_summary")
+            conn.executemany("INSERT INTO completion_summary VALUES (?, ?, ?, ?)", self._rows(matrix))
+            now = time.time()
+            self._set_meta(conn, updated_at=now, rebuilt_at=now, has_owner_column=int(has_owner_column))
+
+    def update(self, matrix):
+        # Upsert just the cells that changed since the last write
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("""
+                INSERT INTO completion_summary VALUES (?, ?, ?, ?)
+                ON CONFLICT(owner, vendor) DO UPDATE SET
+                    total_items = excluded.total_items,
+                    completed_items = excluded.completed_items
+            """, self._rows(matrix))
+            self._set_meta(conn, updated_at=time.time())
+
+    def read(self):
+        # (matrix, meta), or None if the summary has never been built
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM summary_meta").fetchall())
+            if "rebuilt_at" not in meta:
+                return None
+            rows = conn.execute("SELECT owner, vendor, total_items, completed_items FROM completion_summary").fetchall()
+        return pd.DataFrame(rows, columns=SUMMARY_COLUMNS), meta
+
+
+# --- Background job that keeps the summary current ---
+class SummaryWriter:
+    def __init__(self, store, loader, current, interval=SUMMARY_INTERVAL_SECONDS, rebuild_after=SUMMARY_REBUILD_SECONDS):
+        # loader returns a fresh-enough snapshot (loading if needed); current
+        # returns whatever snapshot is already in memory, or None
+        self.store = store
+        self.loader = loader
+        self.current = current
+        self.interval = interval
+        self.rebuild_after = rebuild_after
+        self._counters = None
+        self._rebuilt_at = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="summary-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def notify(self):
+        self._wake.set()
+
+    def refresh(self, rebuild=False):
+        # Writes the cells submissions changed since the last refresh; rebuilds
+        # the whole table when asked, when it is due, or after a sheet reload
+        with self._lock:
+            rebuild = rebuild or time.time() - self._rebuilt_at >= self.rebuild_after
+            snapshot = self.loader() if rebuild else self.current()
+            if snapshot is None:
+                return
+
+            counters = snapshot.progress
+            if rebuild or counters is not self._counters:
+                # Taking the changes first means anything changed while the
+                # matrix is read is written again on the next refresh
+                counters.changes()
+                with metrics.timed("summary.rebuild") as op:
+                    matrix = counters.matrix()
+                    op["rows"] = len(matrix)
+                    self.store.replace(matrix, "TaxPathOwner" in snapshot.df.columns)
+                self._counters = counters
+                self._rebuilt_at = time.time()
+                return
+
+            changed = counters.changes()
+            if len(changed):
+                with metrics.timed("summary.update", rows=len(changed)):
+                    self.store.update(changed)
+
+    def _run(self):
+        while True:
+            if self._wake.wait(self.interval):
+                self._wake.clear()
+            try:
+                self.refresh()
+            except Exception:
+                # A failed load or write is retried on the next tick
+                pass
@@ -0,0 +1,101 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+import bulk_upload
+from bulk_upload import UploadError, process_upload, validate_chunk
+from countries import COUNTRIES
+from hts_index import HTSIndex
+
+US = COUNTRIES.labels["US"]
+VENDOR_SKUS = {"101", "102", "103", "104"}
+
+
+def upload(*rows, index=None):
+    return pd.DataFrame(rows, columns=["SKUID", "CountryofOrigin", "HTSCode"], index=index)
+
+
+def csv_file(*rows):
+    return BytesIO(upload(*rows).to_csv(index=False).encode("utf-8"))
+
+
+# --- validate_chunk ---
+def test_valid_rows_become_submissions_by_canonical_sku():
+    submissions, errors, blank = validate_chunk(upload(("00101", "usa", "0601.10.15")), VENDOR_SKUS)
+    assert submissions == {"101": (US, "0601101500")}
+    assert errors.empty
+    assert blank == 0
+
+
+def test_blank_template_rows_are_counted_not_reported():
+    submissions, errors, blank = validate_chunk(upload(("101", "", ""), ("102", " ", "")), VENDOR_SKUS)
+    assert submissions == {}
+    assert errors.empty
+    assert blank == 2
+
+
+def test_invalid_rows_are_reported_with_their_file_row():
+    chunk = upload(
+        ("101", "US", "0601101500"),
+        ("102", "Narnia", "0601101500"),
+        ("999", "US", "0601101500"),
+        ("103", "US", "12345"),
+    )
+    submissions, errors, _ = validate_chunk(chunk, VENDOR_SKUS)
+    assert list(submissions) == ["101"]
+    assert errors.to_dict("list") == {
+        "Row": [3, 4, 5],
+        "SKU": ["102", "999", "103"],
+        "Error": ["Unknown country", "SKU is not one of this vendor's remaining items", "HTS Code must be 10 digits"],
+    }
+
+
+def test_rows_of_a_later_chunk_keep_their_place_in_the_file():
+    chunk = upload(("102", "Narnia", "0601101500"), index=[5000])
+    _, errors, _ = validate_chunk(chunk, VENDOR_SKUS)
+    assert errors["Row"].tolist() == [5002]
+
+
+def test_codes_are_checked_against_the_schedule():
+    schedule = HTSIndex(["06011015", "0601101500"], ["Lily bulbs", "Lily bulbs"])
+    chunk = upload(("101", "US", "0601101500"), ("102", "US", "0601109900"))
+    submissions, errors, _ = validate_chunk(chunk, VENDOR_SKUS, schedule)
+    assert list(submissions) == ["101"]
+    assert errors["Error"].tolist() == ["HTS Code is not in the tariff schedule"]
+
+
+# --- process_upload ---
+def test_csv_is_validated_chunk_by_chunk(monkeypatch):
+    monkeypatch.setattr(bulk_upload, "UPLOAD_CHUNK_ROWS", 2)
+    data = csv_file(
+        ("101", "US", "0601101500"),
+        ("102", "", ""),
+        ("103", "Narnia", "0601101500"),
+        ("104", "DE", "0601103000"),
+        ("101", "DE", "0601103000"),
+    )
+    submissions, report, skipped = process_upload("items.csv", data, VENDOR_SKUS)
+    # A SKU listed twice keeps its last row
+    assert submissions == {"101": (COUNTRIES.labels["DE"], "0601103000"), "104": (COUNTRIES.labels["DE"], "0601103000")}
+    assert report["Row"].tolist() == [4]
+    assert skipped == 1
+
+
+def test_excel_number_cells_keep_their_hts_code(tmp_path):
+    path = tmp_path / "items.xlsx"
+    pd.DataFrame({"SKUID": [101], "CountryofOrigin": ["US"], "HTSCode": [601101500]}).to_excel(path, index=False)
+    submissions, report, _ = process_upload("items.xlsx", path.open("rb"), VENDOR_SKUS)
+    assert submissions == {"101": (US, "0601101500")}
+    assert report.empty
+
+
+def test_missing_columns_are_an_upload_error():
+    data = BytesIO(b"SKUID,HTSCode\n101,0601101500\n")
+    with pytest.raises(UploadError, match="CountryofOrigin"):
+        process_upload("items.csv", data, VENDOR_SKUS)
+
+
+def test_unreadable_workbook_is_an_upload_error():
+    with pytest.raises(UploadError, match="Excel"):
+        process_upload("items.xlsx", BytesIO(b"not a workbook"), VENDOR_SKUS)
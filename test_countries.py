@@ -0,0 +1,62 @@
+import pandas as pd
+import pycountry
+
+from countries import COUNTRIES, SEARCH_LIMIT, CountryIndex, search_key
+
+LABELS = COUNTRIES.labels
+
+
+def test_search_key_collapses_whitespace_and_case():
+    assert search_key("  south   korea ") == "SOUTH KOREA"
+
+
+def test_labels_pair_code_and_name():
+    assert LABELS["US"] == "US - United States"
+    assert COUNTRIES.options == sorted(LABELS.values())
+
+
+def test_resolve_codes_and_names():
+    assert COUNTRIES.resolve("de") == LABELS["DE"]
+    assert COUNTRIES.resolve("DEU") == LABELS["DE"]
+    assert COUNTRIES.resolve("Germany") == LABELS["DE"]
+    # The label written to the sheet resolves to itself
+    assert COUNTRIES.resolve(LABELS["DE"]) == LABELS["DE"]
+
+
+def test_resolve_aliases():
+    assert COUNTRIES.resolve("USA") == LABELS["US"]
+    assert COUNTRIES.resolve("u.s.a.") == LABELS["US"]
+    assert COUNTRIES.resolve("U.K.") == LABELS["GB"]
+    assert COUNTRIES.resolve("England") == LABELS["GB"]
+    assert COUNTRIES.resolve(" South   Korea ") == LABELS["KR"]
+    assert COUNTRIES.resolve("Vietnam") == LABELS["VN"]
+
+
+def test_resolve_unknown_is_none():
+    assert COUNTRIES.resolve("Narnia") is None
+    assert COUNTRIES.resolve("") is None
+
+
+def test_aliases_do_not_override_official_names():
+    # "GEORGIA" the country must not be claimed by an alias for something else
+    index = CountryIndex([c for c in pycountry.countries if c.alpha_2 in ("GE", "US")], {"GEORGIA": "US"})
+    assert index.resolve("Georgia") == index.labels["GE"]
+
+
+def test_resolve_many_matches_resolve():
+    values = pd.Series(["usa", "Germany", "Narnia", None, " uk "])
+    resolved = COUNTRIES.resolve_many(values)
+    assert resolved.tolist()[:2] == [LABELS["US"], LABELS["DE"]]
+    assert resolved.isna().tolist() == [False, False, True, True, False]
+    assert resolved.iloc[4] == LABELS["GB"]
+
+
+def test_search_by_prefix():
+    matches = COUNTRIES.search("ger")
+    assert LABELS["DE"] in matches
+    assert len(matches) == len(set(matches))
+
+
+def test_search_is_limited_and_ignores_blank_input():
+    assert len(COUNTRIES.search("s")) == SEARCH_LIMIT
+    assert COUNTRIES.search("  ") == []
@@ -0,0 +1,130 @@
+import os
+
+import pandas as pd
+import pytest
+import requests
+
+from hts_index import HTS_SCHEDULE_PATH, HTSIndex, fetch_schedule, format_hts, hts_digits, load_schedule
+
+SCHEDULE_CSV = """HTS Number,Indent,Description,Unit of Quantity
+0601,0,"Bulbs, tubers, tuberous roots, corms, crowns and rhizomes",
+0601.10,1,"Bulbs, tubers, tuberous roots, corms, crowns and rhizomes, dormant",
+0601.10.15,2,Lily bulbs,
+0601.10.15.00,3,Lily bulbs,No.
+,2,Of other plants,
+0601.10.30,3,Other,No.
+0601.20,1,Chicory plants and roots,
+0601.20.10,2,Chicory plants,No.
+"""
+
+
+def make_index():
+    return HTSIndex(
+        ["0601", "060110", "06011015", "0601101500", "06011030", "060120", "06012010"],
+        ["Bulbs", "Bulbs, dormant", "Lily bulbs", "Lily bulbs, stat", "Other bulbs", "Chicory", "Chicory plants"]
+    )
+
+
+def test_hts_digits_and_format_round_trip():
+    assert hts_digits(" 0601.10.15.00 ") == "0601101500"
+    assert hts_digits("0601 10 15 00") == "0601101500"
+    assert format_hts("0601101500") == "0601.10.15.00"
+    assert format_hts("060110") == "0601.10"
+
+
+def test_statistical_lines_are_valid():
+    assert make_index().is_valid("0601.10.15.00")
+
+
+def test_tariff_lines_without_breakdown_are_valid_with_00():
+    index = make_index()
+    assert index.is_valid("0601103000")
+    assert index.is_valid("0601201000")
+
+
+def test_broken_down_tariff_lines_need_a_statistical_suffix():
+    # 0601.10.15 has statistical lines, so "00" only counts if it is one of them
+    index = make_index()
+    assert not index.is_valid("0601101599")
+    assert not index.is_valid("06011015")
+
+
+def test_valid_many_matches_is_valid():
+    index = make_index()
+    codes = pd.Series(["0601101500", "0601103000", "0601109900", None])
+    assert index.valid_many(codes).tolist() == [True, True, False, False]
+
+
+def test_describe_falls_back_to_the_tariff_line():
+    index = make_index()
+    assert index.describe("0601101500") == "Lily bulbs, stat"
+    assert index.describe("0601103000") == "Other bulbs"
+    assert index.describe("9999999999") is None
+
+
+def test_describe_only_describes_valid_codes():
+    # 0601.10.15 is broken down, so "00" is not one of its statistical lines
+    index = HTSIndex(["06011015", "0601101510"], ["Lily bulbs", "Lily bulbs, potted"])
+    assert not index.is_valid("0601101500")
+    assert index.describe("0601101500") is None
+    assert index.describe("0601 10 15 10") == "Lily bulbs, potted"
+
+
+def test_complete_offers_the_next_level_down():
+    index = make_index()
+    assert [code for code, _ in index.complete("0601")] == ["0601.10", "0601.20"]
+    assert [code for code, _ in index.complete("0601.10")] == ["0601.10.15", "0601.10.30"]
+    assert [code for code, _ in index.complete("06011015")] == ["0601.10.15.00"]
+    assert index.complete("0601101500") == []
+    assert index.complete("abc") == []
+
+
+def test_complete_respects_the_limit():
+    assert len(make_index().complete("0601", limit=1)) == 1
+
+
+def test_from_csv_names_the_parent_of_other(tmp_path):
+    path = tmp_path / "hts.csv"
+    path.write_text(SCHEDULE_CSV)
+    index = HTSIndex.from_csv(path)
+    # The unnumbered heading row only labels the rows beneath it
+    assert len(index) == 7
+    assert index.is_valid("0601101500")
+    assert index.is_valid("0601103000")
+    assert index.describe("0601103000") == "Of other plants: Other"
+    assert index.describe("0601201000") == "Chicory plants"
+
+
+def test_load_schedule_without_a_file_is_none(tmp_path):
+    assert load_schedule(str(tmp_path / "missing.csv")) is None
+    assert load_schedule("") is None
+
+
+def test_default_schedule_path_does_not_depend_on_the_working_directory():
+    assert os.path.isabs(HTS_SCHEDULE_PATH)
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+def test_fetch_schedule_saves_a_schedule_that_parses(tmp_path, monkeypatch):
+    monkeypatch.setattr(requests, "get", lambda url, timeout: FakeResponse(SCHEDULE_CSV.encode()))
+    path = tmp_path / "data" / "hts.csv"
+    index = fetch_schedule("https://example.test/hts.csv", str(path))
+    assert len(index) == 7
+    assert len(load_schedule(str(path))) == 7
+
+
+def test_failed_fetch_keeps_the_old_schedule(tmp_path, monkeypatch):
+    path = tmp_path / "hts.csv"
+    path.write_text(SCHEDULE_CSV)
+    monkeypatch.setattr(requests, "get", lambda url, timeout: FakeResponse(b"HTS Number,Indent,Description\n"))
+    with pytest.raises(ValueError):
+        fetch_schedule("https://example.test/hts.csv", str(path))
+    assert path.read_text() == SCHEDULE_CSV
+    assert not os.path.exists(f"{path}.part")
@@ -0,0 +1,81 @@
+import pandas as pd
+
+from reporting import UNASSIGNED_OWNER, CompletionCounters, completion_flags, rollup
+
+
+def items():
+    return pd.DataFrame({
+        "PrimaryVendorNumber": ["V1", "V1", "V1", "V2", "V2"],
+        "PrimaryVendorName": ["Acme", "Acme", "Acme", "Bolt", "Bolt"],
+        "TaxPathOwner": ["Ann", "Ann", "Bo", "Ann", ""],
+        "CountryofOrigin": ["US", "", "DE", "", None],
+        "HTSCode": ["0601101500", "0601101500", "0601101500", "", None],
+    })
+
+
+def cell_counts(matrix):
+    # (owner, vendor) -> (completed, total)
+    return {
+        (row.owner, row.vendor): (row.completed_items, row.total_items)
+        for row in matrix.itertuples(index=False)
+    }
+
+
+# --- completion_flags ---
+def test_an_item_needs_both_country_and_hts():
+    assert completion_flags(items()).tolist() == [True, False, True, False, False]
+
+
+# --- CompletionCounters ---
+def test_counts_match_a_full_recount():
+    counters = CompletionCounters(items())
+    assert counters.overall() == (2, 5)
+    assert counters.vendor("V1") == (2, 3)
+    assert counters.vendor("V2") == (0, 2)
+    assert counters.vendor("V9") == (0, 0)
+    assert cell_counts(counters.matrix()) == {
+        ("Ann", "Acme"): (1, 2),
+        ("Bo", "Acme"): (1, 1),
+        ("Ann", "Bolt"): (0, 1),
+        (UNASSIGNED_OWNER, "Bolt"): (0, 1),
+    }
+
+
+def test_set_flags_moves_only_the_counts_of_changed_rows():
+    counters = CompletionCounters(items())
+    counters.changes()
+    # Row 0 is already complete, so only row 3 changes anything
+    counters.set_flags([0, 3], [True, True])
+    assert counters.overall() == (3, 5)
+    assert counters.vendor("V2") == (1, 2)
+    assert cell_counts(counters.changes()) == {("Ann", "Bolt"): (1, 1)}
+
+
+def test_set_flags_can_mark_rows_incomplete_again():
+    counters = CompletionCounters(items())
+    counters.set_flags([2], [False])
+    assert counters.overall() == (1, 5)
+    assert cell_counts(counters.matrix())[("Bo", "Acme")] == (0, 1)
+
+
+def test_changes_are_reported_once():
+    counters = CompletionCounters(items())
+    counters.set_flags([1], [True])
+    assert cell_counts(counters.changes()) == {("Ann", "Acme"): (2, 2)}
+    assert counters.changes().empty
+    # Setting a flag to what it already is changes nothing
+    counters.set_flags([1], [True])
+    assert counters.changes().empty
+
+
+def test_precomputed_flags_are_used_as_given():
+    counters = CompletionCounters(items(), flags=[True] * 5)
+    assert counters.overall() == (5, 5)
+
+
+# --- rollup ---
+def test_rollup_sums_cells_and_sorts_by_completion():
+    totals = rollup(CompletionCounters(items()).matrix(), "vendor")
+    assert totals["vendor"].tolist() == ["Acme", "Bolt"]
+    assert totals["completed_items"].tolist() == [2, 0]
+    assert totals["completion_percentage"].round(1).tolist() == [66.7, 0.0]
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+
+from sheet_data import (
+    ROWS_MOVED, SKU_NOT_FOUND, SNAPSHOT_COLUMNS, SnapshotCache, combine_chunks, prepare_frame, stream_frame
+)
+from storage import LocalSheetBackend
+
+US_HTS = {"CountryofOrigin": "US - United States", "HTSCode": "0601101500"}
+
+
+def make_backend(count=6):
+    rows = [SNAPSHOT_COLUMNS]
+    for i in range(count):
+        row = {
+            "SKUID": str(101 + i), "SiteOneItemNumber": str(9001 + i), "ProductName": f"Item {i}",
+            "Taxonomy": "Plants", "ImageURL": "", "PrimaryVendorNumber": "V1" if i < 3 else "V2",
+            "PrimaryVendorName": "Acme" if i < 3 else "Bolt", "CountryofOrigin": "", "HTSCode": "",
+            "TaxPathOwner": "Ann"
+        }
+        rows.append([row[column] for column in SNAPSHOT_COLUMNS])
+    return LocalSheetBackend(rows)
+
+
+def make_loader(backend, chunk_rows=4):
+    def loader():
+        chunks, headers, change_token = backend.load(SNAPSHOT_COLUMNS, chunk_rows)
+        df, streamed = stream_frame(chunks)
+        return df, headers, backend, change_token, streamed
+    return loader
+
+
+def cells(backend, sku):
+    # The sheet row holding sku, as {column: value}
+    row = next(row for row in backend.rows[1:] if row[0] == sku)
+    return dict(zip(backend.rows[0], row))
+
+
+def sort_rows_descending(backend):
+    # Someone sorts the sheet by SKU, Z to A, after the snapshot was loaded
+    backend.rows[1:] = sorted(backend.rows[1:], key=lambda row: row[0], reverse=True)
+    backend.touch()
+
+
+# --- SheetSnapshot.write ---
+def test_write_updates_the_row_holding_the_sku():
+    backend = make_backend()
+    snapshot = SnapshotCache().get(make_loader(backend))
+    assert snapshot.write({"102": US_HTS}) == {"102": None}
+    assert cells(backend, "102")["HTSCode"] == "0601101500"
+    assert cells(backend, "103")["HTSCode"] == ""
+
+
+def test_write_reports_unknown_skus():
+    backend = make_backend()
+    snapshot = SnapshotCache().get(make_loader(backend))
+    assert snapshot.write({"999": US_HTS, "101": US_HTS}) == {"999": SKU_NOT_FOUND, "101": None}
+
+
+def test_moved_finds_rows_a_sort_displaced():
+    backend = make_backend(5)
+    snapshot = SnapshotCache().get(make_loader(backend))
+    sort_rows_descending(backend)
+    # Reversing five rows leaves only the middle one where it was
+    rows = {sku: (snapshot.index.row_number(sku), US_HTS) for sku in ["101", "103", "105"]}
+    assert sorted(snapshot.moved(rows)) == ["101", "105"]
+    assert snapshot.moved({}) == []
+
+
+def test_write_skips_rows_that_moved():
+    backend = make_backend()
+    snapshot = SnapshotCache().get(make_loader(backend))
+    sort_rows_descending(backend)
+    assert snapshot.write({"102": US_HTS}) == {"102": ROWS_MOVED}
+    # Nothing was written, least of all into the row 102 used to be on
+    assert all(cells(backend, str(sku))["HTSCode"] == "" for sku in range(101, 107))
+
+
+# --- SnapshotCache.write ---
+def test_cache_write_finds_moved_rows_again_after_a_reload():
+    backend = make_backend()
+    cache = SnapshotCache()
+    loader = make_loader(backend)
+    cache.get(loader)
+    sort_rows_descending(backend)
+
+    assert cache.write({"102": US_HTS, "105": US_HTS}, loader) == {"102": None, "105": None}
+    assert cells(backend, "102")["HTSCode"] == "0601101500"
+    assert cells(backend, "105")["HTSCode"] == "0601101500"
+    assert [sku for sku in map(str, range(101, 107)) if cells(backend, sku)["HTSCode"]] == ["102", "105"]
+    # The reload is now the shared snapshot, indexed in the sheet's new order
+    assert cache.current().index.row_number("102") == 6
+
+
+def test_cache_write_without_a_sheet_is_none():
+    cache = SnapshotCache()
+    assert cache.write({"102": US_HTS}, lambda: None) is None
+
+
+# --- stream_frame / combine_chunks ---
+def test_streamed_frame_matches_one_whole_load():
+    backend = make_backend(7)
+    backend.rows[2][SNAPSHOT_COLUMNS.index("CountryofOrigin")] = "US - United States"
+    backend.rows[2][SNAPSHOT_COLUMNS.index("HTSCode")] = "0601101500"
+    chunks, _, _ = backend.load(SNAPSHOT_COLUMNS, 3)
+    streamed_df, streamed = stream_frame(chunks)
+    whole, _, _ = backend.load(SNAPSHOT_COLUMNS, 100)
+    whole_df = prepare_frame(next(whole))
+
+    pd.testing.assert_frame_equal(streamed_df, whole_df)
+    assert streamed["flags"].tolist() == [False, True, False, False, False, False, False]
+    # Positions are offset by the chunks before them
+    assert streamed["vendor_positions"]["V1"].tolist() == [0, 1, 2]
+    assert streamed["vendor_positions"]["V2"].tolist() == [3, 4, 5, 6]
+
+
+def test_streamed_frame_is_compact():
+    df, _ = stream_frame(make_backend(7).load(SNAPSHOT_COLUMNS, 3)[0])
+    assert isinstance(df["PrimaryVendorName"].dtype, pd.CategoricalDtype)
+    assert df["SKUID"].dtype == np.int8
+    assert df["HTSCode"].dtype == object
+
+
+def test_combine_chunks_unions_categories():
+    first = prepare_frame(pd.DataFrame({
+        "SKUID": ["1"], "PrimaryVendorNumber": ["V1"], "PrimaryVendorName": ["Acme"],
+        "CountryofOrigin": [""], "HTSCode": [""]
+    }))
+    second = prepare_frame(pd.DataFrame({
+        "SKUID": ["2"], "PrimaryVendorNumber": ["V2"], "PrimaryVendorName": ["Bolt"],
+        "CountryofOrigin": [""], "HTSCode": [""]
+    }))
+    df = combine_chunks([first, second])
+    assert df["PrimaryVendorName"].tolist() == ["Acme", "Bolt"]
+    assert list(df["PrimaryVendorName"].cat.categories) == ["Acme", "Bolt"]
+
+
+def test_combine_chunks_widens_ids_one_chunk_needed():
+    parts = [
+        prepare_frame(pd.DataFrame({
+            "SKUID": [sku], "PrimaryVendorNumber": ["V1"], "CountryofOrigin": [""], "HTSCode": [""]
+        }))
+        for sku in ["7", "70000"]
+    ]
+    assert parts[0]["SKUID"].dtype == np.int8
+    df = combine_chunks(parts)
+    assert df["SKUID"].tolist() == [7, 70000]
+    assert df["SKUID"].dtype == np.int32
+
+
+def test_combine_chunks_keeps_a_blank_sku_as_text():
+    parts = [
+        prepare_frame(pd.DataFrame({
+            "SKUID": skus, "PrimaryVendorNumber": ["V1"] * len(skus),
+            "CountryofOrigin": [""] * len(skus), "HTSCode": [""] * len(skus)
+        }))
+        for skus in [["1", "2"], ["", "4"]]
+    ]
+    df = combine_chunks(parts)
+    assert df["SKUID"].astype(str).tolist() == ["1", "2", "", "4"]
+
+
+def test_no_chunks_is_an_empty_frame():
+    df, streamed = stream_frame(iter([]))
+    assert df.empty
+    assert len(streamed["flags"]) == 0
+    assert streamed["vendor_positions"] == {}
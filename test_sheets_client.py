@@ -0,0 +1,162 @@
+import pytest
+
+import sheets_client
+from sheets_client import CircuitBreaker, SheetsClient, SheetsUnavailable, TokenBucket
+
+
+class TransientError(Exception):
+    code = 503
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    # Retry backoff and quota waits would only slow the tests down
+    monkeypatch.setattr(sheets_client.time, "sleep", lambda seconds: None)
+
+
+def failing(error):
+    def fn():
+        raise error
+    return fn
+
+
+def make_client(max_retries=2, failures=2):
+    client = SheetsClient(max_retries=max_retries, acquire_timeout=0)
+    # Half open straight away, so the tests need not wait out the open period
+    client.breaker = CircuitBreaker(failures=failures, open_seconds=0)
+    return client
+
+
+def drain(bucket):
+    while bucket.acquire(0) is not None:
+        pass
+
+
+# --- TokenBucket ---
+def test_bucket_allows_a_burst_then_refuses():
+    bucket = TokenBucket(60)
+    granted = 0
+    while bucket.acquire(0) is not None:
+        granted += 1
+    assert granted == int(bucket.capacity)
+
+
+def test_bucket_capacity_and_refill_stay_within_the_quota():
+    bucket = TokenBucket(60)
+    assert bucket.capacity + bucket.rate * 60 <= 60
+
+
+# --- CircuitBreaker ---
+def test_breaker_opens_after_consecutive_failures():
+    breaker = CircuitBreaker(failures=3, open_seconds=60)
+    breaker.failure()
+    breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_breaker_lets_one_probe_through_when_half_open():
+    breaker = CircuitBreaker(failures=1, open_seconds=0)
+    breaker.failure()
+    assert breaker.allow()
+    assert breaker.is_probe()
+    assert not breaker.allow()
+    breaker.success()
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failures=5, open_seconds=0)
+    for _ in range(5):
+        breaker.failure()
+    assert breaker.allow()
+    breaker.failure()
+    assert breaker.is_open
+    assert not breaker.is_probe()
+
+
+def test_released_probe_can_be_taken_again():
+    breaker = CircuitBreaker(failures=1, open_seconds=0)
+    breaker.failure()
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.is_open
+    assert breaker.allow()
+
+
+# --- SheetsClient ---
+def test_retried_request_counts_as_one_failure():
+    client = make_client(max_retries=4, failures=2)
+    with pytest.raises(SheetsUnavailable):
+        client.call("other", failing(TransientError()))
+    assert not client.breaker.is_open
+
+
+def test_transient_error_that_recovers_resets_the_breaker():
+    client = make_client(max_retries=2)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientError()
+        return "ok"
+
+    assert client.call("other", flaky) == "ok"
+    assert len(attempts) == 3
+    assert not client.breaker.is_open
+
+
+def test_breaker_opens_after_failed_requests():
+    client = make_client(max_retries=0, failures=2)
+    for _ in range(2):
+        with pytest.raises(SheetsUnavailable):
+            client.call("other", failing(TransientError()))
+    assert client.breaker.is_open
+
+
+def test_non_transient_error_is_raised_unchanged():
+    client = make_client()
+    with pytest.raises(BadRequest):
+        client.call("other", failing(BadRequest()))
+    assert not client.breaker.is_open
+
+
+def test_half_open_recovers_after_quota_timeout():
+    client = make_client(max_retries=0, failures=1)
+    with pytest.raises(SheetsUnavailable):
+        client.call("other", failing(TransientError()))
+    assert client.breaker.is_open
+
+    # The half-open probe gives up waiting for read quota...
+    drain(client.buckets["read"])
+    with pytest.raises(SheetsUnavailable, match="quota"):
+        client.call("read", lambda: "ok")
+
+    # ...which must not leave the breaker stuck refusing every request
+    assert client.call("other", lambda: "ok") == "ok"
+    assert not client.breaker.is_open
+
+
+def test_failed_probe_is_not_retried():
+    client = make_client(max_retries=3, failures=1)
+    with pytest.raises(SheetsUnavailable):
+        client.call("other", failing(TransientError()))
+
+    attempts = []
+
+    def still_failing():
+        attempts.append(1)
+        raise TransientError()
+
+    with pytest.raises(SheetsUnavailable):
+        client.call("other", still_failing)
+    assert len(attempts) == 1
+    assert client.breaker.is_open
@@ -0,0 +1,88 @@
+import pandas as pd
+
+from storage import LocalSheetBackend
+
+HEADERS = ["SKUID", "Name", "HTSCode"]
+
+
+def make_backend(numbers):
+    # One data row per entry; None leaves the row blank
+    rows = [HEADERS]
+    for n in numbers:
+        rows.append(["", "", ""] if n is None else [sku(n), f"Item {n}", ""])
+    return LocalSheetBackend(rows)
+
+
+def sku(n):
+    return f"SKU{n}"
+
+
+def load(backend, chunk_rows=4):
+    chunks, headers, _ = backend.load(["SKUID", "Name"], chunk_rows)
+    chunks = list(chunks)
+    assert headers == HEADERS
+    return pd.concat(chunks, ignore_index=True) if chunks else None, chunks
+
+
+# --- read_column_chunks ---
+def test_short_last_chunk():
+    df, chunks = load(make_backend(range(1, 7)))
+    assert df["SKUID"].tolist() == [sku(n) for n in range(1, 7)]
+    assert [len(chunk) for chunk in chunks] == [4, 2]
+
+
+def test_rows_ending_on_a_chunk_boundary():
+    backend = make_backend(range(1, 9))
+    df, chunks = load(backend)
+    assert df["SKUID"].tolist() == [sku(n) for n in range(1, 9)]
+    assert [len(chunk) for chunk in chunks] == [4, 4]
+    # Eight data rows are exactly two ranges; no third one past the grid
+    assert backend.calls["batch_get"] == 2
+
+
+def test_gap_covering_whole_chunks_keeps_later_rows():
+    backend = make_backend([1, 2] + [None] * 9 + [12, 13])
+    df, _ = load(backend)
+    assert len(df) == 13
+    assert df["SKUID"].tolist()[:2] == [sku(1), sku(2)]
+    assert df["SKUID"].tolist()[-2:] == [sku(12), sku(13)]
+    # Blank rows hold their places, so positions still match sheet rows
+    assert (df["SKUID"].iloc[2:11] == "").all()
+    assert df["Name"].iloc[11] == "Item 12"
+
+
+def test_gap_inside_a_chunk_keeps_positions():
+    df, _ = load(make_backend([1, None, 3, None, 5]))
+    assert df["SKUID"].tolist() == [sku(1), "", sku(3), "", sku(5)]
+
+
+def test_trailing_blank_rows_are_dropped():
+    backend = make_backend([1, 2, 3] + [None] * 10)
+    df, _ = load(backend)
+    assert df["SKUID"].tolist() == [sku(1), sku(2), sku(3)]
+    # The blank rows are still read up to the end of the grid, and no further
+    assert backend.calls["batch_get"] == 4
+
+
+def test_sheet_without_data_rows_yields_nothing():
+    df, chunks = load(make_backend([]))
+    assert df is None
+    assert chunks == []
+
+
+def test_text_columns_keep_their_leading_zeros():
+    backend = LocalSheetBackend([
+        ["SKUID", "SiteOneItemNumber", "HTSCode"],
+        ["00123", "42", "0601101500"],
+        ["00124", "43", ""],
+    ])
+    chunks, headers, _ = backend.load(["SKUID", "SiteOneItemNumber", "HTSCode"])
+    df = pd.concat(list(chunks), ignore_index=True)
+    assert df["SKUID"].tolist() == ["00123", "00124"]
+    assert df["HTSCode"].tolist() == ["0601101500", ""]
+    # Other columns are parsed as get_all_records would
+    assert df["SiteOneItemNumber"].tolist() == [42, 43]
+
+    rows = backend.read_rows(headers, [3, 2], ["SKUID", "HTSCode"])
+    assert rows["SKUID"].tolist() == ["00123", "00124"]
+    assert rows["HTSCode"].tolist() == ["0601101500", ""]
@@ -0,0 +1,153 @@
+import pytest
+
+import submission_queue
+from sheet_data import SKU_NOT_FOUND
+from sheets_client import SheetsUnavailable
+from submission_queue import MAX_ATTEMPTS, Rejected, SubmissionFlusher, SubmissionJournal, flush_to_sheet
+
+US_HTS = {"CountryofOrigin": "US - United States", "HTSCode": "0601101500"}
+
+
+class TransientError(Exception):
+    code = 503
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    # Failed rows are due again at once, so a test can flush them repeatedly
+    monkeypatch.setattr(submission_queue, "retry_delay", lambda attempts: 0)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return SubmissionJournal(str(tmp_path / "submissions.db"))
+
+
+def flush_with(journal, results):
+    # One flush whose writer answers every SKU from results (a dict or an exception)
+    def writer(updates):
+        if isinstance(results, Exception):
+            raise results
+        return {sku: results.get(sku) for sku in updates}
+    return SubmissionFlusher(journal, writer).flush()
+
+
+# --- SubmissionJournal ---
+def test_enqueued_rows_are_pending_and_due(journal):
+    journal.enqueue("V1", {"101": US_HTS, "102": US_HTS})
+    assert journal.pending() == {"101": US_HTS, "102": US_HTS}
+    assert [entry["sku"] for entry in journal.due()] == ["101", "102"]
+    assert journal.pending_count() == 2
+
+
+def test_resubmission_replaces_the_queued_values(journal):
+    journal.enqueue("V1", {"101": US_HTS})
+    journal.enqueue("V1", {"101": {**US_HTS, "HTSCode": "0601103000"}})
+    assert journal.pending() == {"101": {**US_HTS, "HTSCode": "0601103000"}}
+
+
+def test_mark_done_keeps_a_newer_resubmission(journal):
+    journal.enqueue("V1", {"101": US_HTS})
+    entries = journal.due()
+    journal.enqueue("V1", {"101": {**US_HTS, "HTSCode": "0601103000"}})
+    journal.mark_done(entries)
+    assert journal.pending() == {"101": {**US_HTS, "HTSCode": "0601103000"}}
+
+
+def test_failed_rows_back_off(journal, monkeypatch):
+    monkeypatch.setattr(submission_queue, "retry_delay", lambda attempts: 60)
+    journal.enqueue("V1", {"101": US_HTS})
+    journal.mark_failed(journal.due(), "Sheet1 is unavailable")
+    assert journal.due() == []
+    assert journal.pending_count() == 1
+
+
+# --- SubmissionFlusher ---
+def test_flush_removes_written_rows(journal):
+    journal.enqueue("V1", {"101": US_HTS, "102": US_HTS})
+    assert flush_with(journal, {"101": None, "102": "Sheet1 is unavailable"}) == 1
+    assert journal.pending() == {"102": US_HTS}
+
+
+@pytest.mark.parametrize("error", [
+    "Sheet1 is unavailable", TransientError(), SheetsUnavailable("Google Sheets is unavailable")
+])
+def test_transient_failures_never_use_up_attempts(journal, error):
+    journal.enqueue("V1", {"101": US_HTS})
+    for _ in range(MAX_ATTEMPTS + 2):
+        flush_with(journal, {"101": error})
+    assert journal.pending() == {"101": US_HTS}
+    assert journal.failed() == []
+    assert journal.due()[0]["attempts"] == 0
+
+
+def test_writer_that_raises_fails_every_row(journal):
+    journal.enqueue("V1", {"101": US_HTS, "102": US_HTS})
+    assert flush_with(journal, TransientError()) == 0
+    assert journal.pending_count() == 2
+
+
+def test_bad_requests_use_up_attempts_then_are_set_aside(journal):
+    journal.enqueue("V1", {"101": US_HTS})
+    for _ in range(MAX_ATTEMPTS):
+        flush_with(journal, {"101": BadRequest("Invalid value")})
+    assert journal.pending() == {}
+    assert [entry["sku"] for entry in journal.failed()] == ["101"]
+    assert journal.failed()[0]["error"] == "Invalid value"
+
+
+def test_rejected_rows_are_set_aside_at_once(journal):
+    journal.enqueue("V1", {"101": US_HTS, "102": US_HTS})
+    flush_with(journal, {"101": Rejected(SKU_NOT_FOUND), "102": None})
+    assert journal.pending() == {}
+    assert [(entry["sku"], entry["error"]) for entry in journal.failed()] == [("101", SKU_NOT_FOUND)]
+
+
+def test_retry_failed_queues_set_aside_rows_again(journal):
+    journal.enqueue("V1", {"101": US_HTS})
+    flush_with(journal, {"101": Rejected(SKU_NOT_FOUND)})
+    assert journal.retry_failed() == 1
+    assert journal.pending() == {"101": US_HTS}
+    assert flush_with(journal, {"101": None}) == 1
+    assert journal.pending_count() == 0
+
+
+def test_resubmitting_a_failed_row_queues_it_again(journal):
+    journal.enqueue("V1", {"101": US_HTS})
+    flush_with(journal, {"101": Rejected(SKU_NOT_FOUND)})
+    journal.enqueue("V1", {"101": US_HTS})
+    assert journal.failed() == []
+    assert journal.pending() == {"101": US_HTS}
+
+
+# --- flush_to_sheet ---
+class RecordingCache:
+    def __init__(self, results):
+        self.results = results
+        self.written = None
+
+    def write(self, updates, loader):
+        self.written = updates
+        return self.results if self.results is None else {sku: self.results.get(sku) for sku in updates}
+
+
+def test_flush_to_sheet_writes_hts_codes_as_text():
+    cache = RecordingCache({})
+    assert flush_to_sheet(cache, None, {"101": US_HTS}) == {"101": None}
+    assert cache.written == {"101": {**US_HTS, "HTSCode": "'0601101500"}}
+
+
+def test_flush_to_sheet_rejects_skus_gone_from_the_sheet():
+    results = flush_to_sheet(RecordingCache({"101": SKU_NOT_FOUND}), None, {"101": US_HTS, "102": US_HTS})
+    assert isinstance(results["101"], Rejected)
+    assert results["102"] is None
+
+
+def test_flush_to_sheet_without_a_sheet_retries_later():
+    results = flush_to_sheet(RecordingCache(None), None, {"101": US_HTS})
+    assert results == {"101": "Sheet1 is unavailable"}
+    assert not isinstance(results["101"], Rejected)
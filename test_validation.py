@@ -0,0 +1,82 @@
+import pandas as pd
+
+from countries import COUNTRIES
+from hts_index import HTSIndex
+from validation import EMPTY_ROW, normalize_hts, validate_edits, validate_pending
+
+US = COUNTRIES.labels["US"]
+
+
+def pending(*rows):
+    return pd.DataFrame(rows, columns=["CountryofOrigin", "HTSCode"])
+
+
+# --- normalize_hts ---
+def test_normalize_hts_pads_six_and_eight_digit_codes():
+    codes = pd.Series(["060110", "06011015", "0601101500"])
+    assert normalize_hts(codes).tolist() == ["0601100000", "0601101500", "0601101500"]
+
+
+def test_normalize_hts_drops_periods_and_spaces():
+    codes = pd.Series(["0601.10.15.00", " 0601 10 15 ", "0601.10"])
+    assert normalize_hts(codes).tolist() == ["0601101500", "0601101500", "0601100000"]
+
+
+def test_normalize_hts_restores_a_leading_zero_excel_dropped():
+    codes = pd.Series(["601101500", "6011015.00", "060110150", "ABCDEFGHI"])
+    assert normalize_hts(codes).tolist() == ["0601101500", "0601101500", "060110150", "ABCDEFGHI"]
+
+
+def test_normalize_hts_leaves_other_lengths_and_blanks_alone():
+    codes = pd.Series(["12345", "0601101", "06011015001", "ABCDEF", None])
+    assert normalize_hts(codes).tolist() == ["12345", "0601101", "06011015001", "ABCDEF", ""]
+
+
+# --- validate_pending ---
+def test_valid_row_is_normalized():
+    values, valid, reasons = validate_pending(pending(("usa", "0601.10.15")))
+    assert valid.tolist() == [True]
+    assert reasons.tolist() == [""]
+    assert values.iloc[0].tolist() == [US, "0601101500"]
+
+
+def test_code_typed_into_a_number_cell_is_valid():
+    values, valid, _ = validate_pending(pending(("US", 601101500)))
+    assert valid.tolist() == [True]
+    assert values["HTSCode"].tolist() == ["0601101500"]
+
+
+def test_each_problem_gets_its_reason():
+    _, valid, reasons = validate_pending(pending(
+        ("", ""),
+        ("", "0601101500"),
+        ("Narnia", "0601101500"),
+        ("US", ""),
+        ("US", "12345"),
+    ))
+    assert not valid.any()
+    assert reasons.tolist() == [
+        EMPTY_ROW,
+        "Country of Origin is missing",
+        "Unknown country",
+        "HTS Code is missing",
+        "HTS Code must be 10 digits",
+    ]
+
+
+def test_codes_are_checked_against_the_schedule_when_given():
+    schedule = HTSIndex(["06011015", "0601101500"], ["Lily bulbs", "Lily bulbs"])
+    _, valid, reasons = validate_pending(pending(("US", "0601101500"), ("US", "0601109900")), schedule)
+    assert valid.tolist() == [True, False]
+    assert reasons.tolist() == ["", "HTS Code is not in the tariff schedule"]
+
+
+# --- validate_edits ---
+def test_validate_edits_splits_submissions_from_errors():
+    submissions, invalid = validate_edits({
+        "101": ("United States", "060110"),
+        "102": ("US", "123"),
+        "103": ("", ""),
+    })
+    assert submissions == {"101": (US, "0601100000")}
+    assert invalid == {"102": "HTS Code must be 10 digits", "103": EMPTY_ROW}
@@ -0,0 +1,145 @@
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# Matches st.image(..., width=45) in the vendor table
+THUMBNAIL_WIDTH = 45
+
+FETCH_TIMEOUT_SECONDS = 3
+FETCH_WORKERS = 16
+
+# Disk cache is trimmed back to 90% of this once it grows past it
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Broken image links are not retried on every rerun
+FAILED_RETRY_SECONDS = 600
+
+
+def make_thumbnail(content):
+    img = Image.open(BytesIO(content))
+    img.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_WIDTH * 10))
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    out = BytesIO()
+    img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+# --- Fetch, shrink and cache product images ---
+class ThumbnailService:
+    def __init__(self, cache_dir, max_bytes=CACHE_MAX_BYTES, workers=FETCH_WORKERS):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="thumbnail")
+
+        self._lock = threading.Lock()
+        self._failed = {}
+        self._size = sum(entry.stat().st_size for entry in os.scandir(cache_dir) if entry.is_file())
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".png")
+
+    def _read(self, url):
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        # Bump mtime so eviction drops the least recently shown images first;
+        # the file may have been evicted since it was read, which is fine
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _fetch(self, url):
+        try:
+            with metrics.timed("images.fetch"):
+                response = self._session.get(url, timeout=FETCH_TIMEOUT_SECONDS)
+                if response.status_code != 200:
+                    raise ValueError(f"HTTP {response.status_code}")
+                data = make_thumbnail(response.content)
+        except Exception:
+            with self._lock:
+                self._failed[url] = time.time()
+            return None
+
+        # A full disk or read-only cache only costs the caching, not the image
+        path = self._path(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            with self._lock:
+                # A concurrent fetch of the same URL may have cached it already;
+                # only a new file adds to the cache size
+                if os.path.exists(path):
+                    os.remove(tmp_path)
+                else:
+                    os.replace(tmp_path, path)
+                    self._size += len(data)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        return data
+
+    def _evict(self):
+        with self._lock:
+            if self._size <= self.max_bytes:
+                return
+            entries = sorted(
+                (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in entries:
+                if self._size <= self.max_bytes * 0.9:
+                    break
+                size = entry.stat().st_size
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                self._size -= size
+
+    def get_many(self, urls):
+        # Returns {url: PNG bytes or None}; cache misses are fetched in parallel
+        thumbnails = {}
+        misses = []
+        now = time.time()
+        for url in dict.fromkeys(urls):
+            data = self._read(url)
+            if data is not None:
+                thumbnails[url] = data
+            elif now - self._failed.get(url, 0) < FAILED_RETRY_SECONDS:
+                thumbnails[url] = None
+            else:
+                misses.append(url)
+
+        # Each fetch runs in a copy of the caller's context, so its timings keep
+        # the vendor and operation labels; pool threads would otherwise start empty
+        futures = [self._executor.submit(contextvars.copy_context().run, self._fetch, url) for url in misses]
+        for url, future in zip(misses, futures):
+            thumbnails[url] = future.result()
+        if misses:
+            self._evict()
+        return thumbnails
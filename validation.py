@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from countries import COUNTRIES
+from hts_index import HTS_SEPARATORS
+
+HTS_DIGITS = 10
+# Shorter codes vendors may only have; the instructions say to add trailing 0s
+HTS_PADDED_LENGTHS = [6, 8]
+# Length of a code from chapters 01-09 once a spreadsheet has stored it as a
+# number and dropped its leading zero (0601101500 -> 601101500)
+HTS_DROPPED_ZERO_LENGTH = HTS_DIGITS - 1
+
+# Reason given to rows with nothing entered; callers usually skip these quietly
+EMPTY_ROW = "Country of Origin and HTS Code are missing"
+
+
+# --- Normalization ---
+def normalize_hts(values):
+    # "0601.10.15" -> "0601101500": drop periods and spaces, restore a leading
+    # zero Excel dropped, and pad 6- and 8-digit codes
+    digits = values.fillna("").astype(str).str.replace(HTS_SEPARATORS, "", regex=True)
+    numeric = digits.str.isdigit()
+    dropped_zero = (digits.str.len() == HTS_DROPPED_ZERO_LENGTH) & numeric & ~digits.str.startswith("0")
+    digits = digits.where(~dropped_zero, "0" + digits)
+    short = digits.str.len().isin(HTS_PADDED_LENGTHS) & numeric
+    return digits.where(~short, digits.str.ljust(HTS_DIGITS, "0"))
+
+
+# --- Validation over all pending rows at once ---
+def validate_pending(edits, hts_index=None):
+    # edits has raw CountryofOrigin and HTSCode input, one row per item.
+    # Returns the normalized values, a validity mask, and the reason each
+    # row was rejected ("" for valid rows), all on edits' index. HTS codes
+    # are checked against hts_index, the local tariff schedule, when given.
+    entered = edits["CountryofOrigin"].fillna("").astype(str).str.strip()
+    countries = COUNTRIES.resolve_many(entered)
+    hts = normalize_hts(edits["HTSCode"])
+    unlisted = ~hts_index.valid_many(hts) if hts_index is not None else np.zeros(len(hts), dtype=bool)
+
+    reasons = pd.Series(np.select(
+        [
+            (entered == "") & (hts == ""),
+            entered == "",
+            countries.isna(),
+            hts == "",
+            ~hts.str.fullmatch(rf"\d{{{HTS_DIGITS}}}"),
+            unlisted
+        ],
+        [
+            EMPTY_ROW,
+            "Country of Origin is missing",
+            "Unknown country",
+            "HTS Code is missing",
+            f"HTS Code must be {HTS_DIGITS} digits",
+            "HTS Code is not in the tariff schedule"
+        ],
+        default=""
+    ), index=edits.index, dtype=object)
+
+    values = pd.DataFrame({"CountryofOrigin": countries, "HTSCode": hts}, index=edits.index)
+    return values, reasons == "", reasons
+
+
+def validate_edits(edits, hts_index=None):
+    # edits maps SKU -> (country, HTS code) as entered. Returns SKU -> (country
+    # label, normalized HTS code) for valid rows and SKU -> reason for the rest.
+    frame = pd.DataFrame.from_dict(edits, orient="index", columns=["CountryofOrigin", "HTSCode"])
+    values, valid, reasons = validate_pending(frame, hts_index)
+    accepted = values[valid]
+    submissions = dict(zip(accepted.index, zip(accepted["CountryofOrigin"], accepted["HTSCode"])))
+    return submissions, reasons[~valid].to_dict()